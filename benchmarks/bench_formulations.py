@@ -0,0 +1,91 @@
+"""
+Benchmark: objective formulations solved head to head on the same instances
+
+Usage: python benchmarks/bench_formulations.py [--scales 1 2 4] [--seeds 0 1 2] [--time-limit 60]
+
+Every formulation of timetable_engine/formulations.py ('assignment-weights' of V1,
+'period-preference' of V2/V3, 'interval-sessions') is solved on the shipped data and on
+synthetic instances where the department is replicated `scale` times (see
+bench_utils.synthetic_departments). 'interval-sessions' schedules several sessions per
+course, so only its model size and timings compare with the other two, not its objective.
+Each seed fixes both the synthetic instance and the CP-SAT random seed. Every run uses
+the solver of generator.create_solver; runs are sequential with a fixed number of
+search workers, so the timings are comparable.
+
+Each row of the table (printed, and saved as CSV with --output) gives the model
+size before and after presolve, the time to the first feasible solution, the time
+to optimality (empty if the time limit was hit first) and the objective value.
+"""
+
+import argparse
+import os
+import re
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from timetable_engine import FORMULATIONS
+from bench_utils import report_rows, solve_instance
+
+COLUMNS = ['instance', 'classes', 'courses', 'formulation', 'seed', 'status',
+           'variables', 'constraints', 'presolved_variables', 'presolved_constraints',
+           'build_time', 'time_to_first_feasible', 'time_to_optimal', 'objective', 'best_bound']
+
+COUNT_PATTERN = re.compile(r"^#(Variables|k\w+): ([\d']+)")
+
+
+def presolved_size(log_lines):
+    """Variables and constraints of the presolved model, read from the CP-SAT search log"""
+    variables = constraints = None
+    in_presolved = False
+    for line in '\n'.join(log_lines).splitlines():
+        if line.startswith('Presolved '):
+            in_presolved = True
+            variables, constraints = None, 0
+            continue
+        if not in_presolved:
+            continue
+        match = COUNT_PATTERN.match(line)
+        if match:
+            count = int(match.group(2).replace("'", ''))
+            if match.group(1) == 'Variables':
+                variables = count
+            else:
+                constraints += count
+        elif not line.startswith('  -'):
+            in_presolved = False
+    return variables, constraints
+
+
+def run(scale, formulation, seed, time_limit, workers):
+    """Build and solve one instance with one formulation, returns a table row"""
+    log_lines = []
+    _, solver, row = solve_instance(scale, seed, time_limit, workers, log_lines, formulation=formulation)
+
+    presolved_variables, presolved_constraints = presolved_size(log_lines)
+    row.update(formulation=formulation, presolved_variables=presolved_variables,
+               presolved_constraints=presolved_constraints,
+               best_bound=int(round(solver.BestObjectiveBound())) if row['objective'] is not None else None)
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--seeds', type=int, nargs='+', default=[0, 1, 2])
+    parser.add_argument('--formulations', nargs='+', choices=sorted(FORMULATIONS), default=sorted(FORMULATIONS))
+    parser.add_argument('--time-limit', type=float, default=60)
+    parser.add_argument('--workers', type=int, default=8, help="CP-SAT search workers of every run")
+    parser.add_argument('--output', default='formulation_benchmark.csv')
+    args = parser.parse_args()
+
+    shown = ['instance', 'formulation', 'seed', 'status', 'variables', 'presolved_variables',
+             'presolved_constraints', 'time_to_first_feasible', 'time_to_optimal', 'objective']
+    runs = (run(scale, formulation, seed, args.time_limit, args.workers)
+            for scale in args.scales for seed in args.seeds for formulation in args.formulations)
+    report_rows(runs, shown, COLUMNS, args.output,
+                widths={'formulation': max(len(name) for name in FORMULATIONS)})
+
+
+if __name__ == '__main__':
+    main()
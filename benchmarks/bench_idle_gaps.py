@@ -0,0 +1,100 @@
+"""
+Benchmark: cost of the idle gap objective against the plain period preference
+
+Usage: python benchmarks/bench_idle_gaps.py [--scales 1 2] [--seeds 0 1 2] [--weights 1 3] [--max-factor 2]
+
+Every instance (the shipped data and the department replicated `scale` times, see
+bench_utils.synthetic_departments) is solved once with the model of build_model and
+once per idle gap weight, with the same CP-SAT seed and number of workers. The idle
+gap auxiliaries are four per class and day, so the model grows by a few percent at most.
+
+Each row gives the model size, the build time, the time to the first feasible
+solution, the time to optimality (empty if the time limit was hit first), and the
+period and idle gap values of the solution (idle gaps are counted on the timetable, so
+the baseline row has them too). The summary compares every weighted run with the
+baseline run of the same instance and seed: the worst ratios of the build time, the
+time to the first solution and, where both runs are optimal, the time to optimality.
+The script exits with status 1 if one of them is above --max-factor.
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_utils import report_rows, solve_instance
+
+COLUMNS = ['instance', 'classes', 'courses', 'idle_gap_weight', 'seed', 'status', 'variables',
+           'constraints', 'build_time', 'time_to_first_feasible', 'time_to_optimal', 'periods',
+           'idle_gaps', 'objective']
+
+# Ratios below this many seconds are noise, both sides are rounded up to it
+MIN_TIME = 0.05
+
+
+def run(scale, idle_gap_weight, seed, time_limit, workers):
+    """Build and solve one instance with one idle gap weight, returns a table row"""
+    generator, solver, row = solve_instance(scale, seed, time_limit, workers, idle_gap_weight=idle_gap_weight)
+
+    row.update(idle_gap_weight=idle_gap_weight, periods=None, idle_gaps=None)
+    if row['objective'] is not None:
+        row['periods'] = int(solver.Value(generator.objectives['periods']))
+        generator.timetable = generator.process_solution(solver)
+        row['idle_gaps'] = generator.compute_statistics()['classes']['idle_gaps']
+    return row
+
+
+def ratio(value, baseline):
+    if value is None or baseline is None:
+        return None
+    return max(value, MIN_TIME) / max(baseline, MIN_TIME)
+
+
+def slowdowns(rows):
+    """Worst ratio of every timing between a weighted run and its baseline run"""
+    baselines = {(row['instance'], row['seed']): row for row in rows if row['idle_gap_weight'] == 0}
+    worst = {}
+    for row in rows:
+        baseline = baselines.get((row['instance'], row['seed']))
+        if row['idle_gap_weight'] == 0 or baseline is None:
+            continue
+        for name in ['build_time', 'time_to_first_feasible', 'time_to_optimal']:
+            value = ratio(row[name], baseline[name])
+            if value is not None:
+                worst[name] = max(worst.get(name, 0), value)
+    return worst
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 2])
+    parser.add_argument('--seeds', type=int, nargs='+', default=[0, 1, 2])
+    parser.add_argument('--weights', type=int, nargs='+', default=[1, 3],
+                        help="idle gap weights compared with the baseline (weight 0)")
+    parser.add_argument('--time-limit', type=float, default=60)
+    parser.add_argument('--workers', type=int, default=8, help="CP-SAT search workers of every run")
+    parser.add_argument('--max-factor', type=float, default=2.0,
+                        help="largest accepted ratio of a weighted run's timings to the baseline's")
+    parser.add_argument('--output', default='idle_gap_benchmark.csv')
+    args = parser.parse_args()
+
+    shown = ['instance', 'idle_gap_weight', 'seed', 'status', 'variables', 'build_time',
+             'time_to_first_feasible', 'time_to_optimal', 'periods', 'idle_gaps']
+    runs = (run(scale, weight, seed, args.time_limit, args.workers)
+            for scale in args.scales for seed in args.seeds
+            for weight in [0] + [weight for weight in args.weights if weight])
+    rows = report_rows(runs, shown, COLUMNS, args.output)
+
+    worst = slowdowns(rows)
+    exceeded = False
+    for name, value in worst.items():
+        within = value <= args.max_factor
+        exceeded = exceeded or not within
+        print(f"Worst {name} ratio: {value:.2f} ({'within' if within else 'above'} {args.max_factor:g}x)")
+    if exceeded:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
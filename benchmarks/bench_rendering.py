@@ -0,0 +1,53 @@
+"""
+Benchmark: serial vs pooled rendering of the per-class HTML and Markdown files
+
+Usage: python benchmarks/bench_rendering.py [--scales 1 10 50] [--repeat 3]
+
+The shipped classes are replicated to emulate larger faculties and filled with a
+random (not necessarily valid) timetable, so no solve is needed.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from timetable_engine import parallel_render
+from bench_utils import load_generator, random_timetable, scale_classes
+
+
+def time_mode(generator, mode, workers, repeat):
+    best = None
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory() as output_dir:
+            jobs = parallel_render.class_jobs(generator, output_dir)
+            start = time.perf_counter()
+            parallel_render.render_outputs(generator, jobs, mode=mode, workers=workers)
+            elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10, 50])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    print(f"{'classes':>8} {'files':>6} " + ' '.join(f"{mode + ' (s)':>12}" for mode in parallel_render.RENDER_MODES))
+    for scale in args.scales:
+        generator = load_generator()
+        scale_classes(generator, scale)
+        random_timetable(generator, seed=scale)
+
+        timings = [time_mode(generator, mode, args.workers, args.repeat) for mode in parallel_render.RENDER_MODES]
+        print(f"{len(generator.classes):>8} {2 * len(generator.classes):>6} "
+              + ' '.join(f"{timing:>12.4f}" for timing in timings))
+
+
+if __name__ == '__main__':
+    main()
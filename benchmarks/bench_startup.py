@@ -0,0 +1,85 @@
+"""
+Benchmark: start-up time of the generator command line
+
+Usage: python benchmarks/bench_startup.py [--repeat 5]
+
+Every command runs in a fresh interpreter, in a scratch directory holding the data files
+and a random (not necessarily valid) timetable.json, so no solve is needed. The table
+shows the median wall time of each command and which heavy dependencies it imported.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_utils import REPO_DIR, load_generator, random_timetable
+
+SCRIPT = os.path.join(REPO_DIR, 'timetable-generator-V3.py')
+
+HEAVY_MODULES = ['ortools', 'pandas', 'numpy']
+
+COMMANDS = [
+    ['--help'],
+    ['render'],
+    ['render', '--output-format', 'compact'],
+    ['validate', 'timetable.json'],
+    ['stats'],
+    ['free-rooms', '--day', 'Monday', '--period', '1']
+]
+
+# Runs the script as __main__, then reports the heavy modules it left in sys.modules
+RUNNER = """
+import runpy, sys
+sys.argv = sys.argv[1:]
+try:
+    runpy.run_path(sys.argv[0], run_name='__main__')
+except SystemExit:
+    pass
+sys.stderr.write('\\nHEAVY ' + ','.join(name for name in %r if name in sys.modules) + '\\n')
+""" % HEAVY_MODULES
+
+
+def run_command(command, cwd, script=SCRIPT):
+    """Wall time of a command in a fresh interpreter and the heavy modules it imported"""
+    env = dict(os.environ, PYTHONPATH=REPO_DIR)
+    argv = [sys.executable, '-c', RUNNER, script] + command if script else [sys.executable] + command
+    start = time.perf_counter()
+    result = subprocess.run(argv, cwd=cwd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    elapsed = time.perf_counter() - start
+    heavy = result.stderr.rsplit('HEAVY ', 1)[-1].strip() if 'HEAVY ' in result.stderr else '?'
+    return elapsed, heavy
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        for name in ('data_salles.json', 'data_cours.json'):
+            shutil.copy(os.path.join(REPO_DIR, name), work_dir)
+        generator = load_generator()
+        with open(os.path.join(work_dir, 'timetable.json'), 'w', encoding='utf-8') as f:
+            json.dump(random_timetable(generator), f)
+
+        # Bare interpreter start-up, the floor of every command
+        baseline = statistics.median(run_command(['-c', 'pass'], work_dir, script=None)[0] for _ in range(args.repeat))
+        print(f"python -c pass: {baseline * 1000:.0f} ms")
+
+        print(f"{'command':<45} {'median (ms)':>12}  heavy imports")
+        for command in COMMANDS:
+            runs = [run_command(command, work_dir) for _ in range(args.repeat)]
+            median = statistics.median(elapsed for elapsed, _ in runs)
+            print(f"{' '.join(command):<45} {median * 1000:>12.0f}  {runs[-1][1] or '-'}")
+
+
+if __name__ == '__main__':
+    main()
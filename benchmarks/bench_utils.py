@@ -0,0 +1,164 @@
+"""
+Helpers shared by the benchmark scripts
+
+The generator scripts have hyphenated file names, so they are loaded by path.
+"""
+
+import csv
+import importlib.util
+import os
+import random
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_generator_module(version='V3'):
+    """Import timetable-generator-<version>.py as a module"""
+    path = os.path.join(REPO_DIR, f"timetable-generator-{version}.py")
+    spec = importlib.util.spec_from_file_location(f"timetable_generator_{version}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def load_generator(version='V3'):
+    """Generator loaded with the shipped data files"""
+    module = load_generator_module(version)
+    return module.TimeTableGenerator(os.path.join(REPO_DIR, 'data_salles.json'),
+                                     os.path.join(REPO_DIR, 'data_cours.json'))
+
+
+def scale_classes(generator, factor):
+    """Replicate every class `factor` times to emulate a larger faculty"""
+    classes = []
+    all_courses = {}
+    for copy_idx in range(factor):
+        for class_id in generator.classes:
+            _, level, semester = class_id.split('-')
+            scaled_id = f"Level-{level}x{copy_idx}-{semester}" if factor > 1 else class_id
+            classes.append(scaled_id)
+            all_courses[scaled_id] = generator.all_courses[class_id]
+    generator.classes = classes
+    generator.all_courses = all_courses
+
+
+def synthetic_departments(generator, factor, seed=0):
+    """Replicate the department `factor` times, every copy with its own lecturers
+
+    Unlike scale_classes the result stays feasible: copies do not share lecturers (nor
+    the "TBD" placeholder, which the model treats as one lecturer). The first copy is the
+    shipped department; the course order of the others is shuffled with `seed`.
+    """
+    rng = random.Random(seed)
+    classes = []
+    all_courses = {}
+    for copy_idx in range(factor):
+        for class_id in generator.classes:
+            _, level, semester = class_id.split('-')
+            scaled_id = f"Level-{level}x{copy_idx}-{semester}" if factor > 1 else class_id
+            courses = generator.all_courses[class_id]
+            if copy_idx:
+                courses = [dict(course, teacher=f"{course['teacher']} #{copy_idx}") for course in courses]
+                rng.shuffle(courses)
+            classes.append(scaled_id)
+            all_courses[scaled_id] = courses
+    generator.classes = classes
+    generator.all_courses = all_courses
+
+
+def random_timetable(generator, seed=0):
+    """Place every course of every class in a random free slot and room (no solver involved)"""
+    rng = random.Random(seed)
+    slots = [(day_idx, period_idx) for day_idx in range(len(generator.days))
+             for period_idx in range(len(generator.periods))]
+    timetable = {}
+    for class_id in generator.classes:
+        grid = [[None for _ in generator.periods] for _ in generator.days]
+        for course, (day_idx, period_idx) in zip(generator.all_courses[class_id], rng.sample(slots, len(slots))):
+            room = rng.choice(generator.rooms)
+            grid[day_idx][period_idx] = {
+                'course_code': course['code'],
+                'course_name': course['name'],
+                'teacher': course['teacher'],
+                'room': room['num'],
+                'building': room['building']
+            }
+        timetable[class_id] = grid
+    generator.timetable = timetable
+    return timetable
+
+
+def solve_instance(scale, seed, time_limit, workers, log_lines=None, **options):
+    """Build and solve the department replicated `scale` times with the generator's solver
+
+    `seed` fixes both the synthetic instance and the CP-SAT random seed, `options` go to
+    the generator and `log_lines` (a list) collects the CP-SAT search log. Returns the
+    generator, the solver and a table row with the columns shared by the solver
+    benchmarks; the objective is None when no solution was found.
+    """
+    from ortools.sat.python import cp_model
+
+    from timetable_engine import TimeTableGenerator
+    from timetable_engine.parameter_sweep import FirstSolutionTimer
+
+    generator = TimeTableGenerator(os.path.join(REPO_DIR, 'data_salles.json'),
+                                   os.path.join(REPO_DIR, 'data_cours.json'), **options)
+    synthetic_departments(generator, scale, seed)
+
+    start = time.perf_counter()
+    generator.build_model()
+    build_time = time.perf_counter() - start
+    proto = generator.model.Proto()
+
+    solver = generator.create_solver(time_limit, workers)
+    solver.parameters.random_seed = seed
+    if log_lines is not None:
+        solver.parameters.log_search_progress = True
+        solver.parameters.log_to_stdout = False
+        solver.log_callback = log_lines.append
+
+    timer = FirstSolutionTimer()
+    status = solver.Solve(generator.model, timer)
+    solved = status == cp_model.OPTIMAL or status == cp_model.FEASIBLE
+
+    row = {
+        'instance': 'shipped' if scale == 1 else f"scaled-x{scale}",
+        'classes': len(generator.classes),
+        'courses': sum(len(courses) for courses in generator.all_courses.values()),
+        'seed': seed,
+        'status': solver.StatusName(status),
+        'variables': len(proto.variables),
+        'constraints': len(proto.constraints),
+        'build_time': round(build_time, 3),
+        'time_to_first_feasible': round(timer.first_solution_time, 3) if timer.first_solution_time is not None else None,
+        'time_to_optimal': round(solver.WallTime(), 3) if status == cp_model.OPTIMAL else None,
+        'objective': int(round(solver.ObjectiveValue())) if solved else None
+    }
+    return generator, solver, row
+
+
+def format_value(value):
+    return '-' if value is None else str(value)
+
+
+def report_rows(rows, shown, columns, output, widths=None):
+    """Print the `shown` columns of every row as it comes in, then save all `columns` as CSV
+
+    `rows` may be a generator running one benchmark per row, so results show up while
+    the next run is going. Returns the rows as a list.
+    """
+    widths = dict({name: max(len(name), 10) for name in shown}, **(widths or {}))
+    print(' '.join(f"{name:>{widths[name]}}" for name in shown))
+
+    results = []
+    for row in rows:
+        results.append(row)
+        print(' '.join(f"{format_value(row[name]):>{widths[name]}}" for name in shown), flush=True)
+
+    with open(output, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(results)
+    print(f"Saved {output}")
+    return results
@@ -0,0 +1,21 @@
+"""
+Timetable engine shared by the timetable-generator-V1/V2/V3.py scripts
+
+One loader, constraint model, solver wrapper, indexer and set of renderers, with
+pluggable objective formulations (see formulations.py):
+
+    from timetable_engine import TimeTableGenerator
+
+    generator = TimeTableGenerator('data_salles.json', 'data_cours.json',
+                                   formulation='assignment-weights')
+    generator.build_model()
+    generator.solve_model(time_limit=60)
+"""
+
+from .formulations import (FORMULATIONS, AssignmentWeights, IntervalSessions, PeriodPreference,
+                           get_formulation)
+from .generator import TimeTableGenerator
+from .legacy_pages import V1TimeTableGenerator, V2TimeTableGenerator
+
+__all__ = ['FORMULATIONS', 'AssignmentWeights', 'IntervalSessions', 'PeriodPreference', 'get_formulation',
+           'TimeTableGenerator', 'V1TimeTableGenerator', 'V2TimeTableGenerator']
@@ -0,0 +1,95 @@
+"""
+Compact JSON payload of a solved timetable, rendered in the browser by a static viewer
+
+Instead of pre-expanding every table in HTML, the timetable is written as a small
+deduplicated data file:
+
+{
+    "version": 1,
+    "days": ["Monday", ...],
+    "periods": ["7:00am - 9:55am", ...],
+    "classes": ["Level-1-s1", ...],
+    "courses": [["INF111", "INTRODUCTION ..."], ...],   # [code, name]
+    "teachers": ["ATSA, ETOUNDI ROGER", ...],
+    "rooms": [["AMPHI", "A1001"], ...],                  # [building, num]
+    "sessions": [[course, teacher, room], ...],         # indexes into the tables above
+    "legends": [[course, ...], ...],                    # course indexes, one list per class
+    "slots": [[0, 3, 0, ...], ...]                      # one dense list per class
+}
+
+slots[c][day * len(periods) + period] is 0 for a free slot, otherwise the 1-based index
+of the session in `sessions`. The static viewer (templates/v3_viewer_foot.html) only
+builds the table of the class being looked at.
+"""
+
+import json
+
+from .timetable_templates import render_template
+
+PAYLOAD_VERSION = 1
+
+
+class _Interner:
+    """Assign consecutive integer ids to values, first come first served"""
+
+    def __init__(self):
+        self.ids = {}
+        self.values = []
+
+    def __call__(self, value):
+        idx = self.ids.get(value)
+        if idx is None:
+            idx = self.ids[value] = len(self.values)
+            self.values.append(value)
+        return idx
+
+
+def build_payload(generator, class_ids=None):
+    """Deduplicated, index-based representation of the solved timetable"""
+    class_ids = sorted(generator.classes if class_ids is None else class_ids)
+    period_count = len(generator.periods)
+
+    courses = _Interner()
+    teachers = _Interner()
+    rooms = _Interner()
+    sessions = _Interner()
+    legends = []
+    slots = []
+
+    for class_id in class_ids:
+        legends.append([courses((course['code'], course['name'])) for course in generator.all_courses[class_id]])
+
+        class_slots = [0] * (len(generator.days) * period_count)
+        for day_idx, row in enumerate(generator.timetable[class_id]):
+            for period_idx, cell in enumerate(row):
+                if not cell:
+                    continue
+                session = (courses((cell['course_code'], cell['course_name'])),
+                           teachers(cell['teacher']),
+                           rooms((cell['building'], cell['room'])))
+                class_slots[day_idx * period_count + period_idx] = sessions(session) + 1
+        slots.append(class_slots)
+
+    return {
+        'version': PAYLOAD_VERSION,
+        'days': generator.days,
+        'periods': generator.periods,
+        'classes': class_ids,
+        'courses': [list(course) for course in courses.values],
+        'teachers': teachers.values,
+        'rooms': [list(room) for room in rooms.values],
+        'sessions': [list(session) for session in sessions.values],
+        'legends': legends,
+        'slots': slots
+    }
+
+
+def dump_payload(payload):
+    """Serialize a payload without any insignificant whitespace"""
+    return json.dumps(payload, ensure_ascii=False, separators=(',', ':'))
+
+
+def iter_viewer_html(data_file):
+    """Static viewer page: the V3 page shell plus the client-side renderer"""
+    yield render_template('v3_combined_head.html')
+    yield render_template('v3_viewer_foot.html', data_file=data_file)
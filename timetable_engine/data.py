@@ -0,0 +1,238 @@
+"""
+Input data shared by every formulation
+
+data_salles.json lists the rooms per faculty, data_cours.json the subjects of every
+level and semester. Each (level, semester) pair is one class, identified as
+'Level-<level>-<semester>'.
+
+data_cours.json may also give the lecturers' availability, as one period bitmask per
+day (bit p set: the p-th period of the day is available). Days that are not listed are
+fully available:
+
+    "availability": {
+        "ATSA, ETOUNDI ROGER": {"Monday": 3, "Saturday": 0}
+    }
+
+Here ATSA only teaches the first two periods on Monday and never on Saturday.
+
+Limits on a lecturer's daily load can be given per lecturer as well, they override
+the defaults of the generator (see lecturer_load_rules):
+
+    "lecturer_limits": {
+        "ATSA, ETOUNDI ROGER": {"max_daily_sessions": 2, "max_consecutive_periods": 1}
+    }
+
+A lecturer is named as in the views, i.e. the parts of their "Course Lecturer" (surname,
+given names) joined with ", ". The order of the parts does not matter, so
+"MONTHE, VALERY" and "VALERY, MONTHE" are the same lecturer (see lecturer_key).
+"""
+
+import json
+import os
+
+from .json_stream import JsonStream
+
+DAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday']
+
+PERIODS = ['7:00am - 9:55am', '10:05am - 12:55pm', '1:05pm - 3:55pm',
+           '4:05pm - 6:55pm', '7:05pm - 9:55pm']
+
+PERIOD_WEIGHTS = [1, 2, 3, 4, 5]  # Lower weights have higher priority
+
+# Course files from this size on are streamed rather than parsed whole
+STREAMING_MIN_SIZE = 32 << 20
+
+# Top-level members of the courses file with the lecturers' availability and load limits
+AVAILABILITY_KEY = 'availability'
+LECTURER_LIMITS_KEY = 'lecturer_limits'
+
+LECTURER_LIMITS = ['max_daily_sessions', 'max_consecutive_periods']
+
+
+def load_rooms(rooms_file):
+    """Flat list of rooms with their number, capacity, building and faculty"""
+    with open(rooms_file, 'r') as f:
+        rooms_data = json.load(f)
+
+    rooms = []
+    for faculty in rooms_data:
+        for room in rooms_data[faculty]:
+            rooms.append({
+                'num': room['num'],
+                'capacity': int(room['capacite']),
+                'building': room['batiment'],
+                'filiere': room['filier']
+            })
+    return rooms
+
+
+def class_name(level, semester):
+    return f"Level-{level}-{semester}"
+
+
+def normalize_subject(subject):
+    """Course record of a subject, None for subjects without a name or code"""
+    # Skip subjects without a name or code
+    if not isinstance(subject.get('name', ''), str) or not subject.get('code', ''):
+        return None
+
+    # Get teacher names
+    teachers = []
+    if subject.get('Course Lecturer') and isinstance(subject['Course Lecturer'], list):
+        teachers.extend([t for t in subject['Course Lecturer'] if t and isinstance(t, str)])
+
+    if not teachers:
+        teacher = "TBD"
+    else:
+        teacher = ", ".join(teachers)
+
+    return {
+        'name': subject.get('name', 'Unnamed Course'),
+        'code': subject.get('code', ''),
+        'teacher': teacher,
+        'credits': subject.get('credit', 0)
+    }
+
+
+def normalize_availability(section):
+    """Lecturer -> {day: period bitmask} of the availability section"""
+    availability = {}
+    for lecturer, day_masks in (section or {}).items():
+        if (not isinstance(day_masks, dict) or not set(day_masks) <= set(DAYS)
+                or not all(isinstance(mask, int) and not isinstance(mask, bool) and mask >= 0
+                           for mask in day_masks.values())):
+            raise ValueError(f"Availability of {lecturer} must map day names to period bitmasks")
+        availability[lecturer] = dict(day_masks)
+    return availability
+
+
+def lecturer_key(name):
+    """Key of a lecturer that does not depend on the order of the parts of their name"""
+    return tuple(sorted(name.split(", ")))
+
+
+def is_available(availability, teacher, day, period_idx):
+    """Whether the lecturer of a course is available in a slot
+
+    `teacher` is the course's "Course Lecturer" joined with ", ", as in normalize_subject.
+    Availability entries match it whatever the order of the parts of the name.
+    """
+    if not availability:
+        return True
+    key = lecturer_key(teacher)
+    for lecturer, day_masks in availability.items():
+        mask = day_masks.get(day)
+        if mask is not None and not mask >> period_idx & 1 and lecturer_key(lecturer) == key:
+            return False
+    return True
+
+
+def normalize_lecturer_limits(section):
+    """Lecturer -> {limit: value} of the lecturer_limits section"""
+    lecturer_limits = {}
+    for lecturer, limits in (section or {}).items():
+        if (not isinstance(limits, dict) or not set(limits) <= set(LECTURER_LIMITS)
+                or not all(isinstance(value, int) and not isinstance(value, bool) and value >= 0
+                           for value in limits.values())):
+            raise ValueError(f"Limits of {lecturer} must map {' and '.join(LECTURER_LIMITS)} to non-negative integers")
+        lecturer_limits[lecturer] = dict(limits)
+    return lecturer_limits
+
+
+def lecturer_load_rules(teachers, lecturer_limits, defaults):
+    """(lecturer, teachers, limits) of every lecturer with a load limit
+
+    `teachers` are the lecturers of the model, i.e. the joined "Course Lecturer" of the
+    courses. The spellings of one lecturer (the same parts in another order, see
+    lecturer_key) share one rule covering all of them, named after the first. The
+    non-None `defaults` apply to every lecturer but "TBD", an entry of lecturer_limits
+    overrides them for its lecturer.
+    """
+    spellings = {}
+    for teacher in sorted(teachers):
+        if teacher != "TBD":
+            spellings.setdefault(lecturer_key(teacher), []).append(teacher)
+    overrides = {}
+    for lecturer, limits in lecturer_limits.items():
+        overrides.setdefault(lecturer_key(lecturer), {}).update(limits)
+
+    rules = []
+    for key, covered in spellings.items():
+        limits = {name: value for name, value in defaults.items() if value is not None}
+        limits.update(overrides.get(key, {}))
+        if limits:
+            rules.append((covered[0], covered, limits))
+    return rules
+
+
+def iter_course_records(courses_file, sections=None):
+    """Stream (class_id, course) records without loading the whole document
+
+    Levels and semesters are walked with JsonStream and subjects are decoded one at a
+    time, so memory is bounded by the largest subject, not by the file. A class is
+    announced by a (class_id, None) record before its courses. The other top-level
+    members are decoded into the `sections` dict when one is given, skipped otherwise.
+    """
+    with open(courses_file, 'r') as f:
+        stream = JsonStream(f)
+        for key in stream.iter_object():
+            if key != 'niveau':
+                value = stream.value()
+                if sections is not None:
+                    sections[key] = value
+                continue
+            for level in stream.iter_object():
+                for semester in stream.iter_object():
+                    class_id = class_name(level, semester)
+                    yield class_id, None
+                    for field in stream.iter_object():
+                        if field != 'subjects' or stream.peek() != '[':
+                            stream.value()
+                            continue
+                        for _ in stream.iter_array():
+                            course = normalize_subject(stream.value())
+                            if course is not None:
+                                yield class_id, course
+
+
+def load_courses(courses_file, streaming=None):
+    """Class ids, the courses of every class, the lecturers' availability and load limits
+
+    With streaming=None, files larger than STREAMING_MIN_SIZE are read with
+    iter_course_records instead of json.load.
+    """
+    if streaming is None:
+        streaming = os.path.getsize(courses_file) >= STREAMING_MIN_SIZE
+
+    all_courses = {}
+    classes = []
+
+    if streaming:
+        sections = {}
+        for class_id, course in iter_course_records(courses_file, sections):
+            if course is None:
+                # A repeated semester replaces the earlier one, as with json.load
+                if class_id not in all_courses:
+                    classes.append(class_id)
+                all_courses[class_id] = []
+            else:
+                all_courses[class_id].append(course)
+        return (classes, all_courses, normalize_availability(sections.get(AVAILABILITY_KEY)),
+                normalize_lecturer_limits(sections.get(LECTURER_LIMITS_KEY)))
+
+    with open(courses_file, 'r') as f:
+        courses_data = json.load(f)
+
+    for level, semesters in courses_data['niveau'].items():
+        for semester, data in semesters.items():
+            class_id = class_name(level, semester)
+            classes.append(class_id)
+
+            all_courses[class_id] = []
+            for subject in data.get('subjects', []):
+                course = normalize_subject(subject)
+                if course is not None:
+                    all_courses[class_id].append(course)
+
+    return (classes, all_courses, normalize_availability(courses_data.get(AVAILABILITY_KEY)),
+            normalize_lecturer_limits(courses_data.get(LECTURER_LIMITS_KEY)))
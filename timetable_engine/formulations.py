@@ -0,0 +1,262 @@
+"""
+Objective formulations of the period preference
+
+Every formulation minimizes the period weights of the scheduled sessions. They differ
+in how the weights reach the objective, and for interval-sessions in the model itself:
+
+- 'assignment-weights' (timetable-generator-V1.py): one term per assignment
+  variable, weight * assign[class, course, room, day, period]
+- 'period-preference' (timetable-generator-V2.py and V3): one reified Boolean per
+  (class, course, period), true iff the course is held in that period, and one
+  term per preference variable
+- 'interval-sessions': every course gets sessions_for_credits(credits) weekly
+  sessions. A session is a unit interval on the week's slot axis with one room
+  literal per room, and no-overlap constraints replace the Boolean grid (see
+  IntervalSessions)
+
+The first two share the class x course x room x day x period Boolean grid and the
+hard constraints of TimeTableGenerator.build_assignment_grid, and have the same
+optimum. The preference variables add classes x courses x periods variables and
+two constraints each, but give the solver a much smaller objective.
+"""
+
+import math
+
+# Credits covered by one weekly session (a 6-credit course meets twice a week)
+CREDITS_PER_SESSION = 3
+
+
+def sessions_for_credits(credits):
+    """Weekly sessions of a course, at least one"""
+    try:
+        return max(1, math.ceil(float(credits) / CREDITS_PER_SESSION))
+    except (TypeError, ValueError):
+        return 1
+
+
+class Formulation:
+    name = None
+
+    # Whether the model is built on the Boolean assignment grid of build_assignment_grid
+    uses_assignment_grid = True
+
+    # Whether the "TBD" placeholder of unassigned courses counts as one lecturer
+    tbd_is_lecturer = True
+
+    def course_sessions(self, course):
+        """Weekly sessions of a course"""
+        return 1
+
+    def build(self, generator):
+        """Add the formulation's variables and constraints to generator.model, return the objective"""
+        raise NotImplementedError
+
+    def assignments(self, generator, value):
+        """(class_id, course_idx, room_idx, day_idx, period_idx) keys of a solution
+
+        `value` reads a variable, e.g. solver.Value or the Value of a solution callback.
+        """
+        return [var_key for var_key, var in generator.assignment_vars.items() if value(var) == 1]
+
+    def hint_vars(self, generator):
+        """Decision variables worth hinting from one solve to the next"""
+        return list(generator.assignment_vars.values()) + list(generator.period_preference_vars.values())
+
+    def add_hints(self, generator, assigned):
+        """Hint every variable so the solver can accept a known solution as a complete one"""
+        preferred = set()
+        for var_key, var in generator.assignment_vars.items():
+            generator.model.AddHint(var, 1 if var_key in assigned else 0)
+            if var_key in assigned:
+                class_id, course_idx, _, _, period_idx = var_key
+                preferred.add((class_id, course_idx, period_idx))
+
+        for pref_key, var in generator.period_preference_vars.items():
+            generator.model.AddHint(var, 1 if pref_key in preferred else 0)
+
+
+class AssignmentWeights(Formulation):
+    """Period weights on the assignment variables themselves"""
+    name = 'assignment-weights'
+
+    def build(self, generator):
+        objective_terms = []
+        for var_key, var in generator.assignment_vars.items():
+            _, _, _, _, period_idx = var_key
+            weight = generator.period_weights[period_idx]
+            objective_terms.append(weight * var)
+
+        return sum(objective_terms)
+
+
+class PeriodPreference(Formulation):
+    """Period weights on one reified preference variable per course and period"""
+    name = 'period-preference'
+
+    def build(self, generator):
+        model = generator.model
+
+        # Group the assignment variables once per (class, course, period)
+        assignments_in_period = {}
+        for var_key, var in generator.assignment_vars.items():
+            class_id, course_idx, _, _, period_idx = var_key
+            assignments_in_period.setdefault((class_id, course_idx, period_idx), []).append(var)
+
+        for class_id in generator.classes:
+            for course_idx in range(len(generator.all_courses[class_id])):
+                for period_idx in range(len(generator.periods)):
+                    pref_key = (class_id, course_idx, period_idx)
+                    pref = model.NewBoolVar(f"pref_{pref_key}")
+                    generator.period_preference_vars[pref_key] = pref
+
+                    assignments = assignments_in_period.get(pref_key)
+                    if assignments:
+                        # pref = (assignment1 OR assignment2 OR ...)
+                        model.AddBoolOr(assignments).OnlyEnforceIf(pref)
+                        model.AddBoolAnd([v.Not() for v in assignments]).OnlyEnforceIf(pref.Not())
+
+        objective_terms = []
+        for pref_key, var in generator.period_preference_vars.items():
+            _, _, period_idx = pref_key
+            objective_terms.append(generator.period_weights[period_idx] * var)
+
+        return sum(objective_terms)
+
+
+class IntervalSessions(Formulation):
+    """Several weekly sessions per course, as unit intervals with no-overlap constraints
+
+    Slots are numbered day * periods + period. Session j of a course has a start slot,
+    its day and period (start = day * periods + period), one room literal per room
+    (exactly one true) and a unit interval. The hard constraints become:
+    - one AddNoOverlap per class and per lecturer over their session intervals
+    - one AddNoOverlap per room over optional intervals present iff the room is chosen
+    - spread: the sessions of a course are held on strictly increasing days (different
+      days, and no symmetric orderings); a course with more sessions than days its
+      lecturers are available on only gets strictly increasing start slots
+    Slots its lecturers are not available in are left out of the variables' domains.
+    The objective is the sum of the period weights of the sessions (AddElement).
+
+    A session costs rooms + 5 variables instead of rooms x days x periods Booleans.
+    Unassigned ("TBD") courses do not share a lecturer here: with several sessions per
+    course, the department's TBD courses alone would fill more slots than a week has.
+    """
+    name = 'interval-sessions'
+    uses_assignment_grid = False
+    tbd_is_lecturer = False
+
+    def course_sessions(self, course):
+        return sessions_for_credits(course['credits'])
+
+    def build(self, generator):
+        from ortools.sat.python import cp_model
+
+        model = generator.model
+        periods_count = len(generator.periods)
+        weights = generator.period_weights
+
+        class_intervals = {}
+        teacher_intervals = {}
+        room_intervals = [[] for _ in generator.rooms]
+        objective_terms = []
+
+        for class_id in generator.classes:
+            for course_idx, course in enumerate(generator.all_courses[class_id]):
+                count = self.course_sessions(course)
+                # The lecturers' availability is compiled into the domains of the slot variables
+                slots = generator.available_slots(class_id, course_idx)
+                starts = cp_model.Domain.FromValues([day_idx * periods_count + period_idx
+                                                     for day_idx, period_idx in slots])
+                days = sorted({day_idx for day_idx, _ in slots})
+                periods = sorted({period_idx for _, period_idx in slots})
+                previous = None
+                for session_idx in range(count):
+                    key = (class_id, course_idx, session_idx)
+                    start = model.NewIntVarFromDomain(starts, f"start_{key}")
+                    day = model.NewIntVarFromDomain(cp_model.Domain.FromValues(days), f"day_{key}")
+                    period = model.NewIntVarFromDomain(cp_model.Domain.FromValues(periods), f"period_{key}")
+                    model.Add(start == periods_count * day + period)
+                    interval = model.NewFixedSizeIntervalVar(start, 1, f"session_{key}")
+
+                    rooms = [model.NewBoolVar(f"room_{key}_{room_idx}") for room_idx in range(len(generator.rooms))]
+                    model.AddExactlyOne(rooms)
+                    for room_idx, literal in enumerate(rooms):
+                        room_intervals[room_idx].append(
+                            model.NewOptionalFixedSizeIntervalVar(start, 1, literal, f"session_{key}_{room_idx}"))
+
+                    class_intervals.setdefault(class_id, []).append(interval)
+                    if course['teacher'] != "TBD":
+                        teacher_intervals.setdefault(course['teacher'], []).append(interval)
+
+                    # Spread rule, which also orders the otherwise interchangeable sessions
+                    if previous is not None:
+                        if count <= len(days):
+                            model.Add(day > previous[1])
+                        else:
+                            model.Add(start > previous[0])
+                    previous = (start, day)
+
+                    weight = model.NewIntVar(min(weights), max(weights), f"weight_{key}")
+                    model.AddElement(period, weights, weight)
+                    objective_terms.append(weight)
+
+                    generator.session_vars[key] = (start, day, period, rooms)
+
+        for class_id in generator.classes:
+            if len(class_intervals.get(class_id, [])) > 1:
+                model.AddNoOverlap(class_intervals[class_id])
+        for teacher in sorted(teacher_intervals):
+            if len(teacher_intervals[teacher]) > 1:
+                model.AddNoOverlap(teacher_intervals[teacher])
+        for intervals in room_intervals:
+            if len(intervals) > 1:
+                model.AddNoOverlap(intervals)
+
+        return sum(objective_terms)
+
+    def assignments(self, generator, value):
+        periods_count = len(generator.periods)
+        keys = []
+        for (class_id, course_idx, _), (start, _, _, rooms) in generator.session_vars.items():
+            room_idx = next(room_idx for room_idx, literal in enumerate(rooms) if value(literal) == 1)
+            day_idx, period_idx = divmod(value(start), periods_count)
+            keys.append((class_id, course_idx, room_idx, day_idx, period_idx))
+        return keys
+
+    def hint_vars(self, generator):
+        hint_vars = []
+        for start, day, period, rooms in generator.session_vars.values():
+            hint_vars.extend([start, day, period])
+            hint_vars.extend(rooms)
+        return hint_vars
+
+    def add_hints(self, generator, assigned):
+        # Sessions of a course are ordered by slot, as required by the spread rule
+        periods_count = len(generator.periods)
+        placed = {}
+        for class_id, course_idx, room_idx, day_idx, period_idx in assigned:
+            placed.setdefault((class_id, course_idx), []).append((day_idx, period_idx, room_idx))
+        for sessions in placed.values():
+            sessions.sort()
+
+        for (class_id, course_idx, session_idx), (start, day, period, rooms) in generator.session_vars.items():
+            sessions = placed.get((class_id, course_idx), [])
+            if session_idx >= len(sessions):
+                continue
+            day_idx, period_idx, room_idx = sessions[session_idx]
+            generator.model.AddHint(start, day_idx * periods_count + period_idx)
+            generator.model.AddHint(day, day_idx)
+            generator.model.AddHint(period, period_idx)
+            for idx, literal in enumerate(rooms):
+                generator.model.AddHint(literal, 1 if idx == room_idx else 0)
+
+
+FORMULATIONS = {formulation.name: formulation
+                for formulation in (AssignmentWeights, PeriodPreference, IntervalSessions)}
+
+
+def get_formulation(name):
+    """Formulation instance from its name"""
+    if name not in FORMULATIONS:
+        raise ValueError(f"Unknown formulation {name}, expected one of {', '.join(sorted(FORMULATIONS))}")
+    return FORMULATIONS[name]()
@@ -0,0 +1,1039 @@
+"""
+Timetable generator shared by every formulation
+
+TimeTableGenerator loads the rooms and courses, builds the CP-SAT model (hard
+constraints plus the objective of the chosen formulation, see formulations.py),
+solves it, and renders the solved timetable. It is the V3 generator; the V1 and V2
+page renderers are in legacy_pages.py.
+"""
+
+import json
+import os
+import time
+
+# Only light modules are imported here so `--help`, validation and rendering start fast;
+# ortools, pandas and NumPy are imported by the code paths that use them
+from .data import (DAYS, PERIODS, PERIOD_WEIGHTS, is_available, lecturer_load_rules, load_courses,
+                   load_rooms)
+from .formulations import get_formulation
+from .snapshot import load_inputs
+from .timetable_templates import render_template
+
+# Objectives of the hierarchical solve mode (see build_secondary_objectives and
+# build_idle_gap_objective)
+LEXICOGRAPHIC_OBJECTIVES = ['periods', 'compact_days', 'building_changes', 'lecturer_load', 'idle_gaps']
+
+# Session table formats of export_timetable_table, pandas writes all of them with pyarrow
+# (Parquet also with fastparquet)
+TABLE_ENGINES = {
+    '.parquet': ['pyarrow', 'fastparquet'],
+    '.feather': ['pyarrow'],
+    '.arrow': ['pyarrow']
+}
+
+
+def check_table_export(filename):
+    """Fail early when the session table cannot be written: unknown format or no engine installed"""
+    import importlib.util
+    
+    extension = os.path.splitext(filename)[1].lower()
+    if extension not in TABLE_ENGINES:
+        raise ValueError(f"Unknown table format {extension}, expected .parquet, .feather or .arrow")
+    engines = TABLE_ENGINES[extension]
+    if not any(importlib.util.find_spec(engine) for engine in engines):
+        raise ImportError(f"Saving {filename} needs {' or '.join(engines)}, install it with: pip install pyarrow")
+
+
+class TimeTableGenerator:
+    # Objective used when none is given, see formulations.py
+    default_formulation = 'period-preference'
+    
+    def __init__(self, rooms_file, courses_file, formulation=None, use_snapshot=True, idle_gap_weight=0,
+                 max_daily_sessions=None, max_consecutive_periods=None):
+        # Load data from JSON files, or from their snapshot when they did not change
+        self.load_data(rooms_file, courses_file, use_snapshot)
+        
+        # Define constants
+        self.days = list(DAYS)
+        self.periods = list(PERIODS)
+        self.period_weights = list(PERIOD_WEIGHTS)  # Lower weights have higher priority
+        
+        self.formulation = get_formulation(formulation or self.default_formulation)
+        
+        # Weight of every idle period of a class against the period weights, 0 to ignore them
+        self.idle_gap_weight = idle_gap_weight
+        
+        # Load limits of every lecturer (None: no limit), the courses file can override them
+        self.lecturer_limit_defaults = {'max_daily_sessions': max_daily_sessions,
+                                        'max_consecutive_periods': max_consecutive_periods}
+        
+    def load_data(self, rooms_file, courses_file, use_snapshot=True):
+        if use_snapshot:
+            (self.rooms, self.classes, self.all_courses,
+             self.availability, self.lecturer_limits) = load_inputs(rooms_file, courses_file)
+        else:
+            self.rooms = load_rooms(rooms_file)
+            self.classes, self.all_courses, self.availability, self.lecturer_limits = load_courses(courses_file)
+        
+    def build_model(self):
+        from ortools.sat.python import cp_model
+        
+        # Initialize the model
+        self.model = cp_model.CpModel()
+        self.assignment_vars = {}
+        self.period_preference_vars = {}
+        self.session_vars = {}
+        self.secondary_vars = []
+        
+        # Constraints 1-5 on the Boolean grid, unless the formulation has its own model
+        if self.formulation.uses_assignment_grid:
+            self.build_assignment_grid()
+        
+        # Constraints 7 and 8: lecturer daily load and consecutive periods, where limited
+        self.build_lecturer_load_limits()
+        
+        # Constraint 6 and objective: minimize the period weights, as set up by the formulation
+        self.objective = self.formulation.build(self)
+        self.objectives = {'periods': self.objective}
+        
+        # Optional compactness: idle periods of the classes, traded against the period weights
+        if self.idle_gap_weight:
+            self.build_idle_gap_objective()
+            self.objective = self.objective + self.idle_gap_weight * self.objectives['idle_gaps']
+        self.model.Minimize(self.objective)
+    
+    def build_assignment_grid(self):
+        """One Boolean per (class, course, room, day, period) and the hard constraints on them"""
+        
+        # For each class, course, room, day, and period, create a binary variable
+        # (none in the slots its lecturers are not available in)
+        for class_id in self.classes:
+            for course_idx, course in enumerate(self.all_courses[class_id]):
+                slots = self.available_slots(class_id, course_idx)
+                for room_idx, room in enumerate(self.rooms):
+                    for day_idx, period_idx in slots:
+                        var_key = (class_id, course_idx, room_idx, day_idx, period_idx)
+                        self.assignment_vars[var_key] = self.model.NewBoolVar(f"assign_{var_key}")
+        
+        # Constraint 1: No class can be scheduled in multiple rooms with different courses at the same time
+        for class_id in self.classes:
+            for day_idx in range(len(self.days)):
+                for period_idx in range(len(self.periods)):
+                    # List all possible assignments for this class at this time
+                    assignments = []
+                    for course_idx in range(len(self.all_courses[class_id])):
+                        for room_idx in range(len(self.rooms)):
+                            var_key = (class_id, course_idx, room_idx, day_idx, period_idx)
+                            if var_key in self.assignment_vars:
+                                assignments.append(self.assignment_vars[var_key])
+                    
+                    # Ensure at most one assignment is made
+                    if assignments:
+                        self.model.Add(sum(assignments) <= 1)
+        
+        # Constraint 2: All courses for a class should be scheduled exactly once per week (CRITICAL)
+        for class_id in self.classes:
+            for course_idx in range(len(self.all_courses[class_id])):
+                # List all possible assignments for this course
+                assignments = []
+                for room_idx in range(len(self.rooms)):
+                    for day_idx in range(len(self.days)):
+                        for period_idx in range(len(self.periods)):
+                            var_key = (class_id, course_idx, room_idx, day_idx, period_idx)
+                            if var_key in self.assignment_vars:
+                                assignments.append(self.assignment_vars[var_key])
+                
+                # Ensure exactly one assignment is made - HARD CONSTRAINT
+                if assignments:
+                    self.model.Add(sum(assignments) == 1)
+        
+        # Constraint 3: A class should not be scheduled to take a course not in its curriculum
+        # (This is implicitly handled by how we created the variables)
+        
+        # Constraint 4: No room can be used by multiple classes at the same time
+        for room_idx in range(len(self.rooms)):
+            for day_idx in range(len(self.days)):
+                for period_idx in range(len(self.periods)):
+                    # List all possible assignments for this room at this time
+                    assignments = []
+                    for class_id in self.classes:
+                        for course_idx in range(len(self.all_courses[class_id])):
+                            var_key = (class_id, course_idx, room_idx, day_idx, period_idx)
+                            if var_key in self.assignment_vars:
+                                assignments.append(self.assignment_vars[var_key])
+                    
+                    # Ensure at most one assignment is made
+                    if assignments:
+                        self.model.Add(sum(assignments) <= 1)
+        
+        # Constraint 5: No teacher can teach multiple classes at the same time
+        # First, get all teachers
+        teachers = set()
+        teacher_courses = {}
+        
+        for class_id in self.classes:
+            for course_idx, course in enumerate(self.all_courses[class_id]):
+                teacher = course['teacher']
+                teachers.add(teacher)
+                
+                if teacher not in teacher_courses:
+                    teacher_courses[teacher] = []
+                
+                teacher_courses[teacher].append((class_id, course_idx))
+        
+        # Now add the constraints, in a fixed order so the model does not depend on the hash seed
+        for teacher in sorted(teachers):
+            for day_idx in range(len(self.days)):
+                for period_idx in range(len(self.periods)):
+                    # List all possible assignments for this teacher at this time
+                    assignments = []
+                    for class_id, course_idx in teacher_courses.get(teacher, []):
+                        for room_idx in range(len(self.rooms)):
+                            var_key = (class_id, course_idx, room_idx, day_idx, period_idx)
+                            if var_key in self.assignment_vars:
+                                assignments.append(self.assignment_vars[var_key])
+                    
+                    # Ensure at most one assignment is made
+                    if assignments:
+                        self.model.Add(sum(assignments) <= 1)
+    
+    def available_slots(self, class_id, course_idx):
+        """(day_idx, period_idx) slots in which all lecturers of a course are available"""
+        course = self.all_courses[class_id][course_idx]
+        slots = [(day_idx, period_idx) for day_idx, day in enumerate(self.days)
+                 for period_idx in range(len(self.periods))
+                 if is_available(self.availability, course['teacher'], day, period_idx)]
+        if not slots:
+            raise ValueError(f"{class_id}: {course['code']} cannot be scheduled, "
+                             f"{course['teacher']} is not available in any slot")
+        return slots
+    
+    def lecturer_load_rules(self):
+        """(lecturer, teachers, limits) of every lecturer with a load limit, see data.lecturer_load_rules"""
+        teachers = {course['teacher'] for class_id in self.classes for course in self.all_courses[class_id]}
+        return lecturer_load_rules(teachers, self.lecturer_limits, self.lecturer_limit_defaults)
+    
+    def build_lecturer_load_limits(self):
+        """Cap the sessions of a lecturer per day and the length of their runs of consecutive periods
+        
+        The assignment variables are bucketed once per (teacher, day, period); every limit is
+        then a sum over the buckets of its lecturer: one constraint per lecturer and day for
+        the daily load, and one per window of max + 1 periods for the consecutive periods.
+        """
+        from ortools.sat.python import cp_model
+        
+        rules = self.lecturer_load_rules()
+        if not rules:
+            return
+        if not self.formulation.uses_assignment_grid:
+            raise ValueError(f"Lecturer load limits need the assignment grid, "
+                             f"the {self.formulation.name} formulation does not have it")
+        
+        # Bucket the assignment variables once per teacher/day/period
+        slot_vars = {}
+        for var_key, var in self.assignment_vars.items():
+            class_id, course_idx, _, day_idx, period_idx = var_key
+            teacher = self.all_courses[class_id][course_idx]['teacher']
+            slot_vars.setdefault((teacher, day_idx, period_idx), []).append(var)
+        
+        periods_count = len(self.periods)
+        for lecturer, teachers, limits in rules:
+            max_daily = limits.get('max_daily_sessions')
+            max_consecutive = limits.get('max_consecutive_periods')
+            for day_idx in range(len(self.days)):
+                period_vars = [[var for teacher in teachers for var in slot_vars.get((teacher, day_idx, period_idx), [])]
+                               for period_idx in range(periods_count)]
+                
+                # Constraint 7: at most max_daily sessions on one day
+                day_vars = [var for assignments in period_vars for var in assignments]
+                if max_daily is not None and len(day_vars) > max_daily:
+                    self.model.Add(cp_model.LinearExpr.Sum(day_vars) <= max_daily)
+                
+                # Constraint 8: every max_consecutive + 1 consecutive periods have a free one
+                if max_consecutive is None:
+                    continue
+                for start in range(periods_count - max_consecutive):
+                    window = [var for assignments in period_vars[start:start + max_consecutive + 1]
+                              for var in assignments]
+                    if len(window) > max_consecutive:
+                        self.model.Add(cp_model.LinearExpr.Sum(window) <= max_consecutive)
+    
+    def build_secondary_objectives(self):
+        """Add the secondary goals used by the hierarchical (lexicographic) solve mode"""
+        if not self.formulation.uses_assignment_grid:
+            raise ValueError(f"Secondary objectives need the assignment grid, "
+                             f"the {self.formulation.name} formulation only supports 'periods'")
+        
+        # Group the assignment variables once per class/day, class/day/building and teacher/day
+        class_day_vars = {}
+        class_day_building_vars = {}
+        teacher_day_vars = {}
+        for var_key, var in self.assignment_vars.items():
+            class_id, course_idx, room_idx, day_idx, _ = var_key
+            building = self.rooms[room_idx]['building']
+            teacher = self.all_courses[class_id][course_idx]['teacher']
+            
+            class_day_vars.setdefault((class_id, day_idx), []).append(var)
+            class_day_building_vars.setdefault((class_id, day_idx, building), []).append(var)
+            if teacher != "TBD":
+                teacher_day_vars.setdefault((teacher, day_idx), []).append(var)
+        
+        # Compact days: number of days each class has to come to campus
+        day_used = []
+        for key, day_vars in class_day_vars.items():
+            used = self.model.NewBoolVar(f"day_used_{key}")
+            self.model.AddMaxEquality(used, day_vars)
+            day_used.append(used)
+        
+        # Building changes: buildings visited by a class on a day, beyond the first one
+        building_used = []
+        for key, building_vars in class_day_building_vars.items():
+            used = self.model.NewBoolVar(f"building_used_{key}")
+            self.model.AddMaxEquality(used, building_vars)
+            building_used.append(used)
+        
+        # Lecturer load: the heaviest day of any lecturer
+        max_daily_load = self.model.NewIntVar(0, len(self.periods), "max_daily_load")
+        for key, load_vars in teacher_day_vars.items():
+            self.model.Add(sum(load_vars) <= max_daily_load)
+        
+        self.secondary_vars += day_used + building_used + [max_daily_load]
+        self.objectives['compact_days'] = sum(day_used)
+        self.objectives['building_changes'] = sum(building_used) - sum(day_used)
+        self.objectives['lecturer_load'] = max_daily_load
+    
+    def build_idle_gap_objective(self):
+        """Add the idle periods between the first and the last session of every class and day
+        
+        A class and day gets four auxiliaries, whatever the number of periods: whether the
+        class comes that day, its first and last periods and the span between them. The
+        occupancy of a period is the sum of its assignment variables (at most one by
+        constraint 1), a linear expression rather than a variable. First and last are pinned
+        to the actual first and last sessions, so span minus sessions is the idle count of
+        every solution, not only of the optimal one.
+        """
+        from ortools.sat.python import cp_model
+        
+        if not self.formulation.uses_assignment_grid:
+            raise ValueError(f"The idle gap objective needs the assignment grid, "
+                             f"the {self.formulation.name} formulation does not have it")
+        
+        # Group the assignment variables once per class/day/period
+        period_vars = {}
+        for var_key, var in self.assignment_vars.items():
+            class_id, _, _, day_idx, period_idx = var_key
+            period_vars.setdefault((class_id, day_idx, period_idx), []).append(var)
+        
+        last_period = len(self.periods) - 1
+        spans = []
+        for class_id in self.classes:
+            for day_idx in range(len(self.days)):
+                occupancy = [(period_idx, period_vars[(class_id, day_idx, period_idx)])
+                             for period_idx in range(len(self.periods))
+                             if (class_id, day_idx, period_idx) in period_vars]
+                if not occupancy:
+                    continue
+                
+                key = (class_id, day_idx)
+                used = self.model.NewBoolVar(f"class_day_used_{key}")
+                first = self.model.NewIntVar(0, last_period, f"first_period_{key}")
+                last = self.model.NewIntVar(0, last_period, f"last_period_{key}")
+                span = self.model.NewIntVar(0, len(self.periods), f"span_{key}")
+                
+                # Every occupied period lies between first and last, and first (last) is not
+                # after (before) a period if no session precedes (follows) it
+                for idx, (period_idx, assignments) in enumerate(occupancy):
+                    occupied = cp_model.LinearExpr.Sum(assignments)
+                    self.model.Add(first <= period_idx + last_period * (1 - occupied))
+                    self.model.Add(last >= period_idx * occupied)
+                    if period_idx > 0:
+                        before = cp_model.LinearExpr.Sum([var for _, other in occupancy[:idx] for var in other])
+                        self.model.Add(first >= period_idx - period_idx * before)
+                    if period_idx < last_period:
+                        after = cp_model.LinearExpr.Sum([var for _, other in occupancy[idx + 1:] for var in other])
+                        self.model.Add(last <= period_idx + (last_period - period_idx) * after)
+                
+                sessions = cp_model.LinearExpr.Sum([var for _, assignments in occupancy for var in assignments])
+                self.model.Add(sessions <= len(self.periods) * used)
+                self.model.Add(sessions >= used)
+                self.model.Add(span == last - first + 1).OnlyEnforceIf(used)
+                self.model.Add(span == 0).OnlyEnforceIf(used.Not())
+                
+                self.secondary_vars += [used, first, last, span]
+                spans.append(span)
+        
+        # Every course is held once (constraint 2), so the sessions add up to a constant and
+        # the objective only has the spans as terms
+        total_sessions = sum(len(self.all_courses[class_id]) for class_id in self.classes)
+        self.objectives['idle_gaps'] = sum(spans) - total_sessions
+    
+    def data_fingerprint(self):
+        """Identify the input data and model options a checkpoint was produced from"""
+        return {
+            'classes': self.classes,
+            'courses': {class_id: [course['code'] for course in self.all_courses[class_id]]
+                        for class_id in self.classes},
+            'rooms': [room['num'] for room in self.rooms],
+            'days': self.days,
+            'periods': self.periods,
+            # The formulation sets the sessions and the objective, the other options the constraints
+            'formulation': self.formulation.name,
+            'sessions': self.session_counts(),
+            'idle_gap_weight': self.idle_gap_weight,
+            'availability': self.availability,
+            'load_rules': [list(rule) for rule in self.lecturer_load_rules()]
+        }
+    
+    def save_checkpoint(self, checkpoint_file, assigned, objective, best_bound, wall_time, status):
+        """Write the best known assignment and solver metadata to disk"""
+        from . import timetable_validator
+        
+        violations = timetable_validator.validate_assignments(assigned, self.classes, self.all_courses,
+                                                              self.rooms, self.days, self.periods,
+                                                              **self.validation_rules())
+        if violations:
+            print(timetable_validator.format_violations(violations))
+        
+        checkpoint = {
+            'fingerprint': self.data_fingerprint(),
+            'violations': len(violations),
+            'status': status,
+            'objective': objective,
+            'best_bound': best_bound,
+            'wall_time': wall_time,
+            'saved_at': time.time(),
+            'assignments': assigned
+        }
+        
+        # Write to a temporary file first so a kill mid-write never corrupts the checkpoint
+        tmp_file = checkpoint_file + '.tmp'
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(checkpoint, f)
+        os.replace(tmp_file, checkpoint_file)
+    
+    def load_checkpoint(self, checkpoint_file):
+        """Load a checkpoint, returning None if it is missing, invalid or belongs to other data"""
+        from . import timetable_validator
+        
+        if not os.path.exists(checkpoint_file):
+            print(f"No checkpoint found at {checkpoint_file}, starting from scratch")
+            return None
+        
+        with open(checkpoint_file, 'r', encoding='utf-8') as f:
+            checkpoint = json.load(f)
+        
+        if checkpoint.get('fingerprint') != self.data_fingerprint():
+            print(f"Checkpoint {checkpoint_file} was made from different input data or options, ignoring it")
+            return None
+        
+        # An invalid assignment must neither warm start the solver nor be written back
+        violations = timetable_validator.validate_assignments(checkpoint['assignments'], self.classes,
+                                                              self.all_courses, self.rooms, self.days,
+                                                              self.periods, **self.validation_rules())
+        if violations:
+            print(f"Checkpoint {checkpoint_file} violates {len(violations)} hard constraint(s), ignoring it")
+            return None
+        
+        return checkpoint
+    
+    def apply_checkpoint(self, checkpoint):
+        """Use a checkpoint as solution hints and objective bounds for the current model"""
+        assigned = set(tuple(var_key) for var_key in checkpoint['assignments'])
+        
+        # Hint every variable so the solver can accept the checkpoint as a complete solution
+        self.formulation.add_hints(self, assigned)
+        
+        # The checkpointed solution is feasible, so the optimum can only be as good or better,
+        # and the proven bound of the interrupted run still holds
+        self.model.Add(self.objective <= int(round(checkpoint['objective'])))
+        self.model.Add(self.objective >= int(checkpoint['best_bound']))
+    
+    def restore_checkpoint_solution(self, checkpoint):
+        """Re-solve with every variable fixed to the checkpoint hints"""
+        from ortools.sat.python import cp_model
+        
+        solver = cp_model.CpSolver()
+        solver.parameters.fix_variables_to_their_hinted_value = True
+        status = solver.Solve(self.model)
+        
+        # "Optimal" here only means optimal once everything is fixed, report the checkpoint's own status
+        if status == cp_model.OPTIMAL and checkpoint['status'] != 'OPTIMAL':
+            status = cp_model.FEASIBLE
+        return solver, status
+    
+    def create_solver(self, time_limit, num_workers=0, solver_profile=None):
+        """Create a solver configured with the generator's default parameters"""
+        from ortools.sat.python import cp_model
+        
+        solver = cp_model.CpSolver()
+        solver.parameters.max_time_in_seconds = time_limit
+        
+        # Enable intermediate solutions to get partial results if time limit is reached
+        solver.parameters.enumerate_all_solutions = False
+        solver.parameters.linearization_level = 0
+        
+        # Tuned parameters for this instance size, as recommended by a parameter sweep
+        if solver_profile:
+            from . import parameter_sweep
+            parameters = parameter_sweep.load_solver_profile(solver_profile, len(self.model.Proto().variables))
+            print(f"Using solver parameters from {solver_profile}: {parameters}")
+            parameter_sweep.apply_solver_parameters(solver, parameters)
+        
+        if num_workers:
+            solver.parameters.num_workers = num_workers
+        
+        return solver
+    
+    def solve_model(self, time_limit=300, checkpoint_file=None, checkpoint_interval=30, resume=False,
+                    num_workers=0, solver_profile=None):
+        from ortools.sat.python import cp_model
+        from .solver_callbacks import CheckpointCallback
+        from . import timetable_validator
+        
+        # Resume from a previous run: warm start and only spend what is left of the time budget
+        elapsed_before = 0.0
+        checkpoint = None
+        if resume and checkpoint_file:
+            checkpoint = self.load_checkpoint(checkpoint_file)
+            if checkpoint is not None:
+                self.apply_checkpoint(checkpoint)
+                elapsed_before = checkpoint['wall_time']
+                print(f"Resuming from checkpoint (objective {checkpoint['objective']}, "
+                      f"{elapsed_before:.1f}s already spent)")
+        
+        # Print progress
+        print("Solving the model. This may take several minutes...")
+        if checkpoint is not None and (checkpoint['status'] == 'OPTIMAL' or elapsed_before >= time_limit):
+            # Nothing left to search, just rebuild the checkpointed solution
+            solver, status = self.restore_checkpoint_solution(checkpoint)
+        else:
+            # Create a solver and solve the model
+            solver = self.create_solver(time_limit - elapsed_before, num_workers, solver_profile)  # 5 minutes by default
+            
+            if checkpoint_file:
+                callback = CheckpointCallback(self, checkpoint_file, checkpoint_interval, elapsed_before)
+                if checkpoint is not None:
+                    # Keep the resumed solution (and the time spent on it) if this run finds nothing better
+                    callback.pending = (checkpoint['assignments'], checkpoint['objective'], checkpoint['best_bound'])
+                status = callback.solve(solver, self.model)
+                
+                if status == cp_model.OPTIMAL or status == cp_model.FEASIBLE:
+                    callback.pending = (callback.pending[0], solver.ObjectiveValue(), solver.BestObjectiveBound())
+                callback.flush('OPTIMAL' if status == cp_model.OPTIMAL else 'FEASIBLE', solver.WallTime())
+            else:
+                status = solver.Solve(self.model)
+            
+            if checkpoint is not None and status != cp_model.OPTIMAL and status != cp_model.FEASIBLE:
+                print("No better solution within the remaining time, keeping the checkpointed one")
+                solver, status = self.restore_checkpoint_solution(checkpoint)
+        
+        print(f"Solver status: {status}")
+        
+        # Keep a summary of the run for reports and scenario comparisons
+        self.solution_info = {
+            'status': solver.StatusName(status),
+            'objective': None,
+            'best_bound': None,
+            'wall_time': elapsed_before + solver.WallTime()
+        }
+        
+        if status == cp_model.OPTIMAL or status == cp_model.FEASIBLE:
+            self.solution_info['objective'] = solver.ObjectiveValue()
+            self.solution_info['best_bound'] = solver.BestObjectiveBound()
+            print(f"Solution found with status {status}")
+            
+            # Check if all courses are scheduled
+            scheduled_count = len(self.solution_assignments(solver.Value))
+            total_sessions = sum(sum(counts) for counts in self.session_counts().values())
+            print(f"Scheduled {scheduled_count} out of {total_sessions} course sessions")
+            
+            # Process the solution
+            self.timetable = self.process_solution(solver)
+            
+            # Double-check the hard constraints independently of the solver
+            print(timetable_validator.format_violations(self.validate()))
+            return True
+        else:
+            print(f"No solution found. Status: {status}")
+            return False
+    
+    def solve_hierarchical(self, objective_names, time_limit=300, num_workers=0, solver_profile=None):
+        """Optimize objectives one after the other, freezing each optimum before the next stage"""
+        from ortools.sat.python import cp_model
+        from .solver_callbacks import FirstSolutionDeadline
+        from . import timetable_validator
+        
+        unknown = [name for name in objective_names if name not in LEXICOGRAPHIC_OBJECTIVES]
+        if unknown:
+            raise ValueError(f"Unknown objectives {', '.join(unknown)}, expected some of "
+                             f"{', '.join(LEXICOGRAPHIC_OBJECTIVES)}")
+        if 'idle_gaps' in objective_names and 'idle_gaps' not in self.objectives:
+            self.build_idle_gap_objective()
+        if any(name not in self.objectives for name in objective_names):
+            self.build_secondary_objectives()
+        
+        hint_vars = self.formulation.hint_vars(self) + self.secondary_vars
+        best_solver = None
+        best_status = None
+        stages = []
+        start = time.time()
+        
+        for stage_idx, name in enumerate(objective_names):
+            # Unused time of a stage is carried over to the next ones
+            remaining = time_limit - (time.time() - start)
+            if remaining <= 0:
+                print(f"No time left for stage {stage_idx + 1}/{len(objective_names)} ({name}), "
+                      f"keeping the previous stage's timetable")
+                break
+            stage_time = remaining / (len(objective_names) - stage_idx)
+            print(f"Stage {stage_idx + 1}/{len(objective_names)}: minimizing {name} ({stage_time:.0f}s)...")
+            
+            self.model.Minimize(self.objectives[name])
+            if stage_idx == 0:
+                # Without a primary solution there is nothing to keep: the first stage may use
+                # the whole budget until it finds one, and stops at its share afterwards
+                solver = self.create_solver(remaining, num_workers, solver_profile)
+                status = FirstSolutionDeadline(solver, stage_time).solve(self.model)
+            else:
+                solver = self.create_solver(stage_time, num_workers, solver_profile)
+                status = solver.Solve(self.model)
+            
+            if status != cp_model.OPTIMAL and status != cp_model.FEASIBLE:
+                message = f"Stage {name} found no solution (status {solver.StatusName(status)})"
+                if best_solver is not None:
+                    message += ", keeping the previous stage's timetable"
+                print(message)
+                stages.append({'objective': name, 'status': solver.StatusName(status), 'value': None})
+                break
+            
+            value = int(round(solver.ObjectiveValue()))
+            stages.append({'objective': name, 'status': solver.StatusName(status), 'value': value,
+                           'wall_time': solver.WallTime()})
+            print(f"Stage {name}: {value} ({solver.StatusName(status)})")
+            best_solver = solver
+            best_status = solver.StatusName(status)
+            
+            # Freeze this objective and warm start the next stage from the current solution
+            if status == cp_model.OPTIMAL:
+                self.model.Add(self.objectives[name] == value)
+            else:
+                self.model.Add(self.objectives[name] <= value)
+            self.model.ClearHints()
+            for var in hint_vars:
+                self.model.AddHint(var, solver.Value(var))
+        
+        self.solution_info = {
+            # Status of the stage whose timetable is kept
+            'status': best_status if best_solver is not None else stages[0]['status'],
+            'objective': stages[0]['value'] if best_solver is not None else None,
+            'best_bound': None,
+            'wall_time': time.time() - start,
+            'stages': stages
+        }
+        
+        if best_solver is None:
+            print("No solution found for the primary objective")
+            return False
+        
+        self.timetable = self.process_solution(best_solver)
+        print(timetable_validator.format_violations(self.validate()))
+        return True
+    
+    def process_solution(self, solver):
+        # Create empty timetable and inverted indexes
+        timetable = {}
+        self.teacher_timetable = {}
+        self.room_timetable = {}
+        
+        for class_id in self.classes:
+            timetable[class_id] = self.empty_grid()
+        
+        # Fill in the timetable based on the solution
+        for class_id, course_idx, room_idx, day_idx, period_idx in self.solution_assignments(solver.Value):
+            course = self.all_courses[class_id][course_idx]
+            room = self.rooms[room_idx]
+            
+            # Store the assignment
+            cell = {
+                'course_code': course['code'],
+                'course_name': course['name'],
+                'teacher': course['teacher'],
+                'room': room['num'],
+                'building': room['building']
+            }
+            timetable[class_id][day_idx][period_idx] = cell
+            self.index_session(class_id, day_idx, period_idx, cell)
+        
+        return timetable
+    
+    def solution_assignments(self, value):
+        """(class_id, course_idx, room_idx, day_idx, period_idx) keys of the solution read by `value`"""
+        return self.formulation.assignments(self, value)
+    
+    def session_counts(self):
+        """Weekly sessions of every course, per class"""
+        return {class_id: [self.formulation.course_sessions(course) for course in self.all_courses[class_id]]
+                for class_id in self.classes}
+    
+    def validation_rules(self):
+        """Formulation-dependent options of the validator"""
+        return {
+            'sessions': self.session_counts(),
+            'ignored_teachers': () if self.formulation.tbd_is_lecturer else ("TBD",),
+            'availability': self.availability,
+            'load_rules': self.lecturer_load_rules()
+        }
+    
+    def empty_grid(self):
+        return [[None for _ in range(len(self.periods))] for _ in range(len(self.days))]
+    
+    def index_session(self, class_id, day_idx, period_idx, cell):
+        """Add a scheduled session to the teacher -> grid and room -> grid indexes"""
+        session = dict(cell, class_id=class_id)
+        
+        # Unassigned courses share the "TBD" placeholder, it is not a lecturer
+        if cell['teacher'] != "TBD":
+            if cell['teacher'] not in self.teacher_timetable:
+                self.teacher_timetable[cell['teacher']] = self.empty_grid()
+            self.teacher_timetable[cell['teacher']][day_idx][period_idx] = session
+        
+        room_key = f"{cell['building']} {cell['room']}"
+        if room_key not in self.room_timetable:
+            self.room_timetable[room_key] = self.empty_grid()
+        self.room_timetable[room_key][day_idx][period_idx] = session
+    
+    def build_indexes(self):
+        """Rebuild the inverted indexes from self.timetable (e.g. after loading it from JSON)"""
+        self.teacher_timetable = {}
+        self.room_timetable = {}
+        for class_id, grid in self.timetable.items():
+            for day_idx, row in enumerate(grid):
+                for period_idx, cell in enumerate(row):
+                    if cell:
+                        self.index_session(class_id, day_idx, period_idx, cell)
+    
+    def validate(self, timetable=None):
+        """Check every hard constraint on a timetable (the solved one by default)"""
+        from . import timetable_validator
+        
+        if timetable is None:
+            timetable = self.timetable
+        return timetable_validator.validate_timetable(timetable, self.classes, self.all_courses,
+                                                      self.rooms, self.days, self.periods,
+                                                      **self.validation_rules())
+    
+    def export_timetable_json(self, filename):
+        """Save the solved timetable grid, it can be edited by hand and checked with --validate"""
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(self.timetable, f, indent=2, ensure_ascii=False)
+    
+    def compute_statistics(self, timetable=None):
+        """Room utilization, period distribution, lecturer load and class idle gaps"""
+        from . import timetable_stats
+        
+        if timetable is None:
+            timetable = self.timetable
+        return timetable_stats.compute_statistics(timetable, self.classes, self.rooms, self.days,
+                                                  self.periods, self.period_weights)
+    
+    def to_dataframe(self, timetable=None):
+        """One row per scheduled session, with categorical columns for analytics"""
+        import pandas as pd
+        
+        if timetable is None:
+            timetable = self.timetable
+        
+        columns = {name: [] for name in ('class_id', 'course_code', 'course_name', 'teacher',
+                                         'building', 'room', 'day', 'period')}
+        for class_id, grid in timetable.items():
+            for day_idx, row in enumerate(grid):
+                for period_idx, cell in enumerate(row):
+                    if not cell:
+                        continue
+                    columns['class_id'].append(class_id)
+                    columns['course_code'].append(cell['course_code'])
+                    columns['course_name'].append(cell['course_name'])
+                    columns['teacher'].append(cell['teacher'])
+                    columns['building'].append(cell['building'])
+                    columns['room'].append(cell['room'])
+                    columns['day'].append(day_idx)
+                    columns['period'].append(period_idx)
+        
+        # Days and periods keep their calendar order, codes are stored once per distinct value
+        frame = {
+            'class_id': pd.Categorical(columns['class_id'], categories=self.classes),
+            'course_code': pd.Categorical(columns['course_code']),
+            'course_name': pd.Categorical(columns['course_name']),
+            'teacher': pd.Categorical(columns['teacher']),
+            'building': pd.Categorical(columns['building']),
+            'room': pd.Categorical(columns['room']),
+            'day': pd.Categorical.from_codes(columns['day'], categories=self.days, ordered=True),
+            'period': pd.Categorical.from_codes(columns['period'], categories=self.periods, ordered=True)
+        }
+        return pd.DataFrame(frame)
+    
+    def export_timetable_table(self, filename):
+        """Save the session table as Parquet (.parquet) or Feather/Arrow (.feather, .arrow), needs pyarrow"""
+        check_table_export(filename)
+        frame = self.to_dataframe()
+        if os.path.splitext(filename)[1].lower() == '.parquet':
+            frame.to_parquet(filename, index=False)
+        else:
+            frame.to_feather(filename)
+    
+    def room_occupancy(self, timetable=None):
+        """Rooms x days x periods occupancy bitmap of a timetable (the solved one by default)"""
+        from . import room_occupancy
+        
+        if timetable is None:
+            timetable = self.timetable
+        return room_occupancy.RoomOccupancy.from_timetable(timetable, self.rooms, self.days, self.periods)
+    
+    def class_label(self, class_id):
+        level, semester = class_id.split('-')[1], class_id.split('-')[2]
+        return f"Niveau {level} - Semestre {semester}"
+    
+    def class_page_entries(self, class_ids):
+        """Page entries (see iter_html_page) of class timetables"""
+        for class_id in class_ids:
+            yield {
+                'id': class_id,
+                'label': self.class_label(class_id),
+                'grid': self.timetable[class_id],
+                'legend': self.all_courses[class_id],
+                'lines': lambda cell: [('course-code', cell['course_code']),
+                                       ('instructor', cell['teacher']),
+                                       ('room', f"{cell['building']} {cell['room']}")]
+            }
+    
+    def view_page_entries(self, view):
+        """Page entries of the teacher or room view, read from the inverted indexes"""
+        if view == 'teacher':
+            index = self.teacher_timetable
+            lines = lambda cell: [('course-code', cell['course_code']),
+                                  ('instructor', self.class_label(cell['class_id'])),
+                                  ('room', f"{cell['building']} {cell['room']}")]
+        elif view == 'room':
+            index = self.room_timetable
+            lines = lambda cell: [('course-code', cell['course_code']),
+                                  ('instructor', cell['teacher']),
+                                  ('room', self.class_label(cell['class_id']))]
+        else:
+            raise ValueError(f"Unknown view {view}, expected 'teacher' or 'room'")
+        
+        entries = []
+        for idx, key in enumerate(sorted(index)):
+            legend = {}
+            for row in index[key]:
+                for cell in row:
+                    if cell:
+                        legend.setdefault(cell['course_code'], cell['course_name'])
+            entries.append({
+                'id': f"{view}-{idx + 1}",
+                'label': key,
+                'grid': index[key],
+                'legend': [{'code': code, 'name': name} for code, name in sorted(legend.items())],
+                'lines': lines
+            })
+        return entries
+    
+    def iter_view_html_timetable(self, view):
+        """Yield the page with one timetable per teacher or per room"""
+        yield from self.iter_html_page(self.view_page_entries(view))
+    
+    def iter_combined_html_timetable(self, class_ids=None):
+        """Yield the combined HTML page fragment by fragment, in document order
+        
+        With class_ids, only those timetables are included (a single class gives its own page).
+        """
+        class_ids = sorted(self.classes if class_ids is None else class_ids)
+        yield from self.iter_html_page(list(self.class_page_entries(class_ids)))
+    
+    def iter_html_page(self, entries):
+        """Yield a navigable page with one timetable per entry
+        
+        An entry is a dict with the container 'id', the 'label' of its button and title,
+        its day x period 'grid' of cells, the 'legend' courses and a 'lines' function
+        giving the (css class, text) lines shown in a cell.
+        """
+        
+        # Static page shell (styles and header), compiled once per process
+        yield render_template('v3_combined_head.html')
+        
+        # Add navigation buttons
+        for entry in entries:
+            yield f"""
+                    <button class="nav-button" onclick="showTimetable('{entry['id']}')">{entry['label']}</button>
+            """
+            
+        yield """
+                </div>
+                
+                <button class="print-button" onclick="window.print()">Imprimer tous les emplois du temps</button>
+        """
+        
+        # Add timetable containers
+        for entry in entries:
+            yield f"""
+                <div id="{entry['id']}" class="timetable-container">
+                    <h2 class="timetable-title">{entry['label']}</h2>
+                    <table>
+                        <thead>
+                            <tr>
+                                <th class="time-col">Horaire</th>
+            """
+            
+            # Add day headers
+            for day in self.days:  # Including Saturday
+                yield f"<th>{day}</th>"
+                
+            yield """
+                            </tr>
+                        </thead>
+                        <tbody>
+            """
+            
+            # Add rows for each period
+            for period_idx, period in enumerate(self.periods):
+                yield f"""
+                            <tr>
+                                <td class="time-col">{period}</td>
+                """
+                
+                # Add cells for each day
+                for day_idx in range(len(self.days)):
+                    cell = entry['grid'][day_idx][period_idx]
+                    
+                    if cell:
+                        lines = entry['lines'](cell)
+                        yield f"""
+                                <td>
+                                    <div class="course-container">
+                                        <div class="{lines[0][0]}">{lines[0][1]}</div>
+                                        <div class="{lines[1][0]}">{lines[1][1]}</div>
+                                        <div class="{lines[2][0]}">{lines[2][1]}</div>
+                                    </div>
+                                </td>
+                        """
+                    else:
+                        yield '<td class="empty-cell"></td>'
+                
+                yield """
+                            </tr>
+                """
+                
+            yield """
+                        </tbody>
+                    </table>
+                    
+                    <div class="legend">
+                        <h3>Légende des Cours</h3>
+                        <div class="legend-items">
+            """
+            
+            # Add course legend
+            for course in entry['legend']:
+                yield f"""
+                            <div class="legend-item">
+                                <span class="legend-code">{course['code']}</span>: {course['name']}
+                            </div>
+                """
+                
+            yield """
+                        </div>
+                    </div>
+                </div>
+            """
+            
+        # Footer and navigation JavaScript
+        yield render_template('v3_combined_foot.html')
+    
+    def class_output_name(self, class_id):
+        """Base file name of the per-class outputs"""
+        return f"timetable_{class_id.replace('-', '_')}"
+    
+    def __getstate__(self):
+        """Only the data and the solved timetable are sent to render worker processes"""
+        state = dict(self.__dict__)
+        for name in ['model', 'assignment_vars', 'period_preference_vars', 'session_vars', 'objective',
+                     'objectives', 'secondary_vars']:
+            state.pop(name, None)
+        return state
+    
+    def generate_combined_html_timetable(self):
+        """Generate a single HTML file containing all timetables with navigation"""
+        return ''.join(self.iter_combined_html_timetable())
+    
+    def write_combined_html_timetable(self, filename, buffer_size=1 << 16):
+        """Stream the combined HTML page to a file without building it in memory"""
+        with open(filename, 'w', encoding='utf-8', buffering=buffer_size) as f:
+            f.writelines(self.iter_combined_html_timetable())
+    
+    def generate_markdown_timetable(self, class_id):
+        """Generate Markdown for a specific class timetable"""
+        
+        if class_id not in self.timetable:
+            return f"No timetable found for {class_id}"
+            
+        # Extract level and semester from class_id
+        level, semester = class_id.split('-')[1], class_id.split('-')[2]
+        
+        markdown = f"""# Emploi du Temps - Niveau {level} - Semestre {semester}
+## Département d'Informatique
+### Année académique 2024-2025
+
+| Horaire | Lundi | Mardi | Mercredi | Jeudi | Vendredi | Samedi |
+|---------|-------|-------|----------|-------|----------|--------|
+"""
+        
+        # Add rows for each period
+        for period_idx, period in enumerate(self.periods):
+            row = f"| {period} | "
+            
+            # Add cells for each day - ALL 6 DAYS INCLUDING SATURDAY
+            for day_idx in range(6):
+                cell = self.timetable[class_id][day_idx][period_idx]
+                
+                if cell:
+                    row += f"**{cell['course_code']}** ({cell['teacher']})<br>{cell['building']} {cell['room']} | "
+                else:
+                    row += " | "
+            
+            markdown += row + "\n"
+            
+        markdown += """
+## Légende
+"""
+        
+        # Add course legend
+        for course in self.all_courses[class_id]:
+            markdown += f"- **{course['code']}**: {course['name']}\n"
+            
+        return markdown
+
+    def generate_view_markdown(self, view):
+        """Generate Markdown with one timetable per teacher or per room"""
+        title = {'teacher': "par Enseignant", 'room': "par Salle"}
+        entries = self.view_page_entries(view)
+        
+        markdown = f"""# Emplois du Temps {title[view]}
+## Département d'Informatique
+### Année académique 2024-2025
+"""
+        for entry in entries:
+            markdown += f"\n## {entry['label']}\n\n"
+            markdown += "| Horaire | " + " | ".join(self.days) + " |\n"
+            markdown += "|---------|" + "|".join("-" * (len(day) + 2) for day in self.days) + "|\n"
+            
+            for period_idx, period in enumerate(self.periods):
+                row = f"| {period} | "
+                for day_idx in range(len(self.days)):
+                    cell = entry['grid'][day_idx][period_idx]
+                    if cell:
+                        lines = entry['lines'](cell)
+                        row += f"**{lines[0][1]}** ({lines[1][1]})<br>{lines[2][1]} | "
+                    else:
+                        row += " | "
+                markdown += row + "\n"
+        
+        return markdown
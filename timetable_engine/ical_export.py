@@ -0,0 +1,144 @@
+"""
+iCalendar (.ics) export of a solved timetable
+
+Every session becomes a weekly recurring VEVENT, written to one calendar per class,
+per lecturer and per room:
+
+    ics/class_Level_1_s1.ics
+    ics/teacher_TSOPZE_NORBERT.ics
+    ics/room_AMPHI_A250.ics
+
+The first week starts at `start_date` and the events repeat for `weeks` weeks. Times
+are floating local times (no time zone), as read from the period labels, e.g.
+'10:05am - 12:55pm'. Lecturer and room calendars are read from the inverted indexes
+built by process_solution. Calendars are generated line by line and streamed to their
+files; the start and end of every (day, period) slot are formatted once per export.
+"""
+
+import datetime
+import os
+import re
+
+from .parallel_render import write_atomic
+
+PRODUCT_ID = "-//Departement d'Informatique//Timetable Generator//FR"
+
+TIME_PATTERN = re.compile(r'(\d{1,2}):(\d{2})\s*([ap]m)', re.IGNORECASE)
+
+WEEKDAYS = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+
+
+def parse_period(label):
+    """Start and end times of a period label such as '7:00am - 9:55am'"""
+    times = []
+    for hour, minute, meridiem in TIME_PATTERN.findall(label):
+        hour = int(hour) % 12 + (12 if meridiem.lower() == 'pm' else 0)
+        times.append(datetime.time(hour, int(minute)))
+    if len(times) != 2:
+        raise ValueError(f"Cannot read the start and end times of period {label!r}")
+    return times[0], times[1]
+
+
+def escape_text(value):
+    return (str(value).replace('\\', '\\\\').replace(';', '\\;')
+            .replace(',', '\\,').replace('\n', '\\n'))
+
+
+def fold(line):
+    """Split a content line in chunks of at most 75 octets (RFC 5545, 3.1)"""
+    encoded = line.encode('utf-8')
+    if len(encoded) <= 75:
+        return line + '\r\n'
+    chunks = []
+    start = 0
+    limit = 75
+    while start < len(encoded):
+        end = min(start + limit, len(encoded))
+        # Do not cut a multi-byte character
+        while end < len(encoded) and (encoded[end] & 0xC0) == 0x80:
+            end -= 1
+        chunks.append(encoded[start:end].decode('utf-8'))
+        start = end
+        limit = 74  # continuation lines start with a space
+    return '\r\n '.join(chunks) + '\r\n'
+
+
+def slot_times(days, periods, start_date):
+    """DTSTART/DTEND values of every (day, period) slot in the first week"""
+    monday = start_date - datetime.timedelta(days=start_date.weekday())
+    times = {}
+    for day_idx, day in enumerate(days):
+        weekday = WEEKDAYS.index(day.lower()) if day.lower() in WEEKDAYS else day_idx
+        date = monday + datetime.timedelta(days=weekday)
+        if date < start_date:
+            date += datetime.timedelta(days=7)
+        for period_idx, period in enumerate(periods):
+            start, end = parse_period(period)
+            times[(day_idx, period_idx)] = (datetime.datetime.combine(date, start).strftime('%Y%m%dT%H%M%S'),
+                                            datetime.datetime.combine(date, end).strftime('%Y%m%dT%H%M%S'))
+    return times
+
+
+def safe_name(value):
+    return re.sub(r'[^A-Za-z0-9]+', '_', value).strip('_')
+
+
+def iter_calendar(name, sessions, times, weeks, stamp, class_labels):
+    """Lines of a calendar, sessions are (day_idx, period_idx, class_id, cell) tuples"""
+    yield 'BEGIN:VCALENDAR\r\n'
+    yield 'VERSION:2.0\r\n'
+    yield fold(f"PRODID:{PRODUCT_ID}")
+    yield 'CALSCALE:GREGORIAN\r\n'
+    yield fold(f"X-WR-CALNAME:{escape_text(name)}")
+
+    for day_idx, period_idx, class_id, cell in sessions:
+        start, end = times[(day_idx, period_idx)]
+        yield 'BEGIN:VEVENT\r\n'
+        yield fold(f"UID:{safe_name(class_id)}-{cell['course_code']}-{day_idx}-{period_idx}@timetable-generator")
+        yield f"DTSTAMP:{stamp}\r\n"
+        yield f"DTSTART:{start}\r\n"
+        yield f"DTEND:{end}\r\n"
+        yield f"RRULE:FREQ=WEEKLY;COUNT={weeks}\r\n"
+        yield fold(f"SUMMARY:{escape_text(cell['course_code'])} - {escape_text(cell['course_name'])}")
+        yield fold(f"LOCATION:{escape_text(cell['building'])} {escape_text(cell['room'])}")
+        yield fold(f"DESCRIPTION:{escape_text(class_labels[class_id])}\\nEnseignant : {escape_text(cell['teacher'])}")
+        yield 'END:VEVENT\r\n'
+
+    yield 'END:VCALENDAR\r\n'
+
+
+def iter_grid_sessions(grid, class_id=None):
+    """(day_idx, period_idx, class_id, cell) of a grid; index cells carry their class_id"""
+    for day_idx, row in enumerate(grid):
+        for period_idx, cell in enumerate(row):
+            if cell:
+                yield day_idx, period_idx, class_id or cell['class_id'], cell
+
+
+def export_calendars(generator, output_dir='ics', start_date=None, weeks=15):
+    """Write one .ics file per class, lecturer and room, returns the written file names"""
+    if start_date is None:
+        start_date = datetime.date.today()
+    if not hasattr(generator, 'teacher_timetable'):
+        generator.build_indexes()
+
+    os.makedirs(output_dir, exist_ok=True)
+    times = slot_times(generator.days, generator.periods, start_date)
+    stamp = datetime.datetime.now(datetime.timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+    class_labels = {class_id: generator.class_label(class_id) for class_id in generator.classes}
+
+    calendars = []
+    for class_id in generator.classes:
+        calendars.append((f"class_{safe_name(class_id)}.ics", class_labels[class_id],
+                          iter_grid_sessions(generator.timetable[class_id], class_id)))
+    for teacher, grid in generator.teacher_timetable.items():
+        calendars.append((f"teacher_{safe_name(teacher)}.ics", teacher, iter_grid_sessions(grid)))
+    for room, grid in generator.room_timetable.items():
+        calendars.append((f"room_{safe_name(room)}.ics", room, iter_grid_sessions(grid)))
+
+    filenames = []
+    for filename, name, sessions in calendars:
+        path = os.path.join(output_dir, filename)
+        write_atomic(path, iter_calendar(name, sessions, times, weeks, stamp, class_labels), newline='')
+        filenames.append(path)
+    return filenames
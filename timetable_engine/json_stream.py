@@ -0,0 +1,109 @@
+"""
+Incremental reader for large JSON documents
+
+The document is read in chunks and walked one container at a time: iter_object and
+iter_array yield before each member and the caller consumes the member, either by
+walking into it or by decoding it whole with value() (the standard JSON decoder, on
+the buffered text). Only the value being decoded and one chunk are held in memory.
+
+    stream = JsonStream(f)
+    for key in stream.iter_object():
+        if key == 'wanted':
+            for _ in stream.iter_array():
+                handle(stream.value())
+        else:
+            stream.value()  # skip it
+"""
+
+import json
+import re
+
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+class JsonStream:
+    def __init__(self, f, chunk_size=1 << 16):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def fill(self, size=None):
+        """Append the next chunk to the buffer, dropping the consumed text; False at end of file"""
+        if self.eof:
+            return False
+        chunk = self.f.read(size or self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Next non-whitespace character, without consuming it ('' at end of file)"""
+        while True:
+            self.pos = WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ''
+
+    def next_char(self):
+        char = self.peek()
+        self.pos += 1
+        return char
+
+    def expect(self, expected):
+        char = self.next_char()
+        if char != expected:
+            raise ValueError(f"Expected {expected!r} but found {char or 'end of file'!r}")
+
+    def value(self):
+        """Decode the next complete value"""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # The value goes past the buffer, read as much again as is buffered
+                if not self.fill(max(self.chunk_size, len(self.buffer) - self.pos)):
+                    raise
+                continue
+            # A number at the very end of the buffer may continue in the next chunk
+            if end == len(self.buffer) and self.fill():
+                continue
+            self.pos = end
+            return value
+
+    def iter_object(self):
+        """Yield the keys of the next object, the caller consumes each member's value"""
+        self.expect('{')
+        if self.peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(':')
+            yield key
+            char = self.next_char()
+            if char == '}':
+                return
+            if char != ',':
+                raise ValueError(f"Expected ',' or '}}' but found {char or 'end of file'!r}")
+
+    def iter_array(self):
+        """Yield before each element of the next array, the caller consumes the element"""
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield
+            char = self.next_char()
+            if char == ']':
+                return
+            if char != ',':
+                raise ValueError(f"Expected ',' or ']' but found {char or 'end of file'!r}")
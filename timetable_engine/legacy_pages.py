@@ -0,0 +1,346 @@
+"""
+Page renderers of the earlier generators
+
+timetable-generator-V1.py and V2.py keep their own pages (the V1 per-class and
+combined pages, the V2 page with stats cards and filters) on top of the shared
+engine, with the formulation each of them was written with.
+"""
+
+from .generator import TimeTableGenerator
+from .timetable_templates import render_template
+
+
+class V1Pages:
+    """Per-class pages and combined page of timetable-generator-V1.py"""
+    
+    def iter_html_timetable(self, class_id):
+        """Yield the HTML page of a class fragment by fragment, in document order"""
+        
+        if class_id not in self.timetable:
+            yield f"<p>No timetable found for {class_id}</p>"
+            return
+            
+        # Extract level and semester from class_id
+        level, semester = class_id.split('-')[1], class_id.split('-')[2]
+        
+        # Static page shell (styles, header), compiled once per process
+        yield render_template('v1_class_head.html', level=level, semester=semester)
+        
+        # Add day headers
+        for day in self.days[:5]:  # Excluding Saturday
+            yield f"<th>{day}</th>"
+            
+        yield """
+                    </tr>
+                </thead>
+                <tbody>
+        """
+        
+        # Add rows for each period
+        for period_idx, period in enumerate(self.periods):
+            yield f"""
+                    <tr>
+                        <td class="time-col">{period}</td>
+            """
+            
+            # Add cells for each day
+            for day_idx in range(5):  # Excluding Saturday
+                cell = self.timetable[class_id][day_idx][period_idx]
+                
+                if cell:
+                    yield f"""
+                        <td>
+                            <div class="course-name">{cell['course_code']}</div>
+                            <div class="instructor">{cell['teacher']}</div>
+                            <div class="room">{cell['building']} {cell['room']}</div>
+                        </td>
+                    """
+                else:
+                    yield '<td class="empty-cell"></td>'
+            
+            yield """
+                    </tr>
+            """
+            
+        yield """
+                </tbody>
+            </table>
+            
+            <div style="margin-top: 30px;">
+                <h3 style="color: #003366; border-bottom: 1px solid #ddd; padding-bottom: 5px;">Légende des Cours</h3>
+        """
+        
+        # Add course legend
+        for course in self.all_courses[class_id]:
+            yield f"""
+                <div style="margin-bottom: 5px;">
+                    <span style="font-weight: bold; color: #003366;">{course['code']}</span>: {course['name']}
+                </div>
+            """
+            
+        yield """
+            </div>
+        </body>
+        </html>
+        """
+    
+    def generate_html_timetable(self, class_id):
+        """Generate HTML for a specific class timetable"""
+        return ''.join(self.iter_html_timetable(class_id))
+    
+    def generate_all_timetables(self):
+        """Generate HTML timetables for all classes"""
+        
+        html_timetables = {}
+        
+        for class_id in self.classes:
+            html_timetables[class_id] = self.generate_html_timetable(class_id)
+            
+        return html_timetables
+        
+    def iter_combined_html_timetable(self):
+        """Yield the combined HTML page fragment by fragment, in document order
+        
+        generate_combined_html_timetable and write_combined_html_timetable of the engine
+        join it or stream it to a buffered file.
+        """
+        
+        # Start HTML document
+        yield render_template('v1_combined_head.html')
+        
+        # Add navigation buttons
+        for class_id in sorted(self.classes):
+            level, semester = class_id.split('-')[1], class_id.split('-')[2]
+            yield f"""
+                <button class="nav-button" onclick="showTimetable('{class_id}')">Niveau {level} - Semestre {semester}</button>
+            """
+            
+        yield """
+            </div>
+            
+            <button class="print-button" onclick="window.print()">Imprimer tous les emplois du temps</button>
+        """
+        
+        # Add timetable containers
+        for class_id in sorted(self.classes):
+            level, semester = class_id.split('-')[1], class_id.split('-')[2]
+            
+            yield f"""
+            <div id="{class_id}" class="timetable-container">
+                <h2>Niveau {level} - Semestre {semester}</h2>
+                <table>
+                    <thead>
+                        <tr>
+                            <th class="time-col">Horaire</th>
+            """
+            
+            # Add day headers - INCLUDE ALL 6 DAYS
+            for day in self.days:  # Including Saturday
+                yield f"<th>{day}</th>"
+                
+            yield """
+                        </tr>
+                    </thead>
+                    <tbody>
+            """
+            
+            # Add rows for each period
+            for period_idx, period in enumerate(self.periods):
+                yield f"""
+                        <tr>
+                            <td class="time-col">{period}</td>
+                """
+                
+                # Add cells for each day - INCLUDE ALL 6 DAYS
+                for day_idx in range(6):  # Including Saturday
+                    cell = self.timetable[class_id][day_idx][period_idx]
+                    
+                    if cell:
+                        yield f"""
+                            <td>
+                                <div class="course-name">{cell['course_code']}</div>
+                                <div class="instructor">{cell['teacher']}</div>
+                                <div class="room">{cell['building']} {cell['room']}</div>
+                            </td>
+                        """
+                    else:
+                        yield '<td class="empty-cell"></td>'
+                
+                yield """
+                        </tr>
+                """
+                
+            yield """
+                    </tbody>
+                </table>
+                
+                <div class="legend">
+                    <h3>Légende des Cours</h3>
+            """
+            
+            # Add course legend
+            for course in self.all_courses[class_id]:
+                yield f"""
+                    <div class="legend-item">
+                        <span class="legend-code">{course['code']}</span>: {course['name']}
+                    </div>
+                """
+                
+            yield """
+                </div>
+            </div>
+            """
+            
+        # Navigation JavaScript
+        yield render_template('v1_combined_foot.html')
+
+
+class V2Pages:
+    """Combined page with stats cards and filters of timetable-generator-V2.py"""
+    
+    def iter_combined_html_timetable(self, stats=None):
+        """Yield the combined HTML page fragment by fragment, in document order"""
+        
+        if stats is None:
+            stats = self.compute_stats()
+        
+        # Static page shell (styles, header, stats cards, filters), compiled once per process
+        yield render_template('v2_combined_head.html', **stats)
+        
+        # Add navigation buttons
+        for class_id in sorted(self.classes):
+            level, semester = class_id.split('-')[1], class_id.split('-')[2]
+            yield f'''
+                    <button class="nav-button" onclick="showTimetable(\'{class_id}\')">Niveau {level} - Semestre {semester}</button>'''
+            
+        yield '''
+                </div>
+                
+                <button class="print-button" onclick="window.print()">Imprimer tous les emplois du temps</button>'''
+        
+        # Add timetable containers
+        for class_id in sorted(self.classes):
+            level, semester = class_id.split('-')[1], class_id.split('-')[2]
+            
+            yield f'''
+                <div id="{class_id}" class="timetable-container">
+                    <h2 class="timetable-title">Niveau {level} - Semestre {semester}</h2>
+                    <table>
+                        <thead>
+                            <tr>
+                                <th class="time-col">Horaire</th>'''
+            
+            # Add day headers
+            for day in self.days:  # Including Saturday
+                yield f'''<th>{day}</th>'''
+                
+            yield '''
+                            </tr>
+                        </thead>
+                        <tbody>'''
+            
+            # Add rows for each period
+            for period_idx, period in enumerate(self.periods):
+                yield f'''
+                            <tr class="period-row {'morning-row' if period_idx < 2 else 'afternoon-row'}">
+                                <td class="time-col">{period}</td>'''
+                
+                # Add cells for each day
+                for day_idx in range(len(self.days)):
+                    cell = self.timetable[class_id][day_idx][period_idx]
+                    
+                    if cell:
+                        # Determine if amphi or td/tp based on room
+                        room_class = "amphi-cell" if "AMPHI" in cell['building'] else "tdtp-cell"
+                        
+                        yield f'''
+                                <td class="course-cell {room_class}">
+                                    <div class="course-container">
+                                        <div class="course-code">{cell['course_code']}</div>
+                                        <div class="course-name">{cell['course_name']}</div>
+                                        <div class="instructor">{cell['teacher']}</div>
+                                        <div class="room">{cell['building']} {cell['room']}</div>
+                                    </div>
+                                </td>'''
+                    else:
+                        yield '''<td class="empty-cell"></td>'''
+                
+                yield '''
+                            </tr>'''
+                
+            yield '''
+                        </tbody>
+                    </table>
+                    
+                    <div class="legend">
+                        <h3>Légende des Cours</h3>
+                        <div class="legend-items">'''
+            
+            # Add course legend
+            for course in self.all_courses[class_id]:
+                yield f'''
+                            <div class="legend-item">
+                                <span class="legend-code">{course['code']}</span>: {course['name']}
+                            </div>'''
+                
+            yield '''
+                        </div>
+                    </div>
+                </div>'''
+            
+        # Footer, navigation and filtering JavaScript
+        yield render_template('v2_combined_foot.html')
+    
+    def compute_stats(self):
+        """Summary figures shown in the stats cards of the combined page"""
+        total_courses = 0
+        morning_courses = 0
+        rooms_used = set()
+        
+        for class_id in self.classes:
+            for day_idx in range(len(self.days)):
+                for period_idx in range(len(self.periods)):
+                    cell = self.timetable[class_id][day_idx][period_idx]
+                    if cell:
+                        total_courses += 1
+                        rooms_used.add(cell['room'])
+                        if period_idx < 2:  # Morning periods (0-1)
+                            morning_courses += 1
+        
+        # Calculate percentages
+        if total_courses > 0:
+            morning_percentage = int((morning_courses / total_courses) * 100)
+        else:
+            morning_percentage = 0
+            
+        # Calculate occupancy rate
+        total_slots = len(self.classes) * len(self.days) * len(self.periods)
+        if total_slots > 0:
+            occupancy_rate = int((total_courses / total_slots) * 100)
+        else:
+            occupancy_rate = 0
+        
+        return {
+            'TOTAL_COURSES': total_courses,
+            'ROOMS_USED': len(rooms_used),
+            'TOTAL_ROOMS': len(self.rooms),
+            'OCCUPANCY_RATE': occupancy_rate,
+            'MORNING_PERCENTAGE': morning_percentage
+        }
+    
+    def generate_combined_html_timetable(self, stats=None):
+        """Generate a single HTML file containing all timetables with navigation"""
+        return ''.join(self.iter_combined_html_timetable(stats))
+    
+    def write_combined_html_timetable(self, filename, stats=None, buffer_size=1 << 16):
+        """Stream the combined HTML page to a file without building it in memory"""
+        with open(filename, 'w', encoding='utf-8', buffering=buffer_size) as f:
+            f.writelines(self.iter_combined_html_timetable(stats))
+
+
+class V1TimeTableGenerator(V1Pages, TimeTableGenerator):
+    default_formulation = 'assignment-weights'
+
+
+class V2TimeTableGenerator(V2Pages, TimeTableGenerator):
+    default_formulation = 'period-preference'
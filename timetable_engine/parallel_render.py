@@ -0,0 +1,169 @@
+"""
+Parallel rendering stage for the per-class outputs
+
+Every class gets its own HTML page and Markdown file. Rendering and writing them are
+independent jobs, fanned out over a thread or process pool. Files are written to a
+temporary file in the target directory and renamed into place, so readers never see
+a half-written timetable.
+
+Rendering is incremental: each output is recorded in a manifest (render_manifest.json in
+the output directory) with a hash of the class grid, its course legend and the page
+templates. Outputs whose hash did not change since the last run are neither rendered
+nor rewritten, so file sync and web caches only see the classes that actually moved.
+
+Modes:
+- serial: plain loop, no pool
+- thread: overlaps the file writes, rendering itself still holds the GIL
+- process: renders in worker processes, the generator is sent once per worker
+- auto: process on multi-core machines once there are enough files, serial otherwise
+  (a few dozen small files render faster than a pool starts, see benchmarks/bench_rendering.py)
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from .timetable_templates import templates_fingerprint
+
+RENDER_MODES = ['serial', 'thread', 'process']
+
+# Below this many jobs the pool start-up costs more than it saves
+AUTO_MIN_JOBS = 200
+
+MANIFEST_FILE = 'render_manifest.json'
+
+# Bump when the markup produced by the renderers changes, so every output is rebuilt
+RENDERER_VERSION = 1
+
+
+def write_atomic(filename, content, newline=None):
+    """Write bytes, a string or an iterable of string fragments to `filename` atomically"""
+    directory = os.path.dirname(os.path.abspath(filename))
+    fd, tmp_file = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(filename)}.", suffix='.tmp')
+    try:
+        if isinstance(content, bytes):
+            f = os.fdopen(fd, 'wb')
+        else:
+            f = os.fdopen(fd, 'w', encoding='utf-8', buffering=1 << 16, newline=newline)
+        with f:
+            if isinstance(content, (str, bytes)):
+                f.write(content)
+            else:
+                f.writelines(content)
+        os.chmod(tmp_file, 0o644)  # mkstemp creates private files
+        os.replace(tmp_file, filename)
+    except BaseException:
+        os.unlink(tmp_file)
+        raise
+
+
+def class_jobs(generator, output_dir='.', kinds=('html', 'markdown'), class_ids=None):
+    """List the (kind, class_id, filename) render jobs of every class"""
+    extensions = {'html': 'html', 'markdown': 'md'}
+    jobs = []
+    for class_id in (generator.classes if class_ids is None else class_ids):
+        for kind in kinds:
+            filename = os.path.join(output_dir, f"{generator.class_output_name(class_id)}.{extensions[kind]}")
+            jobs.append((kind, class_id, filename))
+    return jobs
+
+
+def class_content_hash(generator, class_id):
+    """Hash of everything a class's outputs are rendered from"""
+    content = {
+        'renderer': RENDERER_VERSION,
+        'templates': templates_fingerprint(),
+        'days': generator.days,
+        'periods': generator.periods,
+        'grid': generator.timetable.get(class_id),
+        'legend': [[course['code'], course['name']] for course in generator.all_courses[class_id]]
+    }
+    return hashlib.sha256(json.dumps(content, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def combined_content_hash(class_hashes):
+    """Hash of the combined page, derived from the hashes of all its classes"""
+    content = json.dumps(sorted(class_hashes.items()))
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+def static_content_hash(filename):
+    """Hash of a page that only depends on the templates (e.g. the compact viewer)"""
+    content = json.dumps([RENDERER_VERSION, templates_fingerprint(), filename])
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+def load_manifest(output_dir='.'):
+    """Previously rendered outputs and their content hashes"""
+    path = os.path.join(output_dir, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_manifest(manifest, output_dir='.'):
+    write_atomic(os.path.join(output_dir, MANIFEST_FILE), json.dumps(manifest, indent=2, sort_keys=True))
+
+
+def is_up_to_date(manifest, filename, content_hash):
+    """True if `filename` exists and was rendered from the same content"""
+    return manifest.get(os.path.basename(filename)) == content_hash and os.path.exists(filename)
+
+
+def stale_jobs(jobs, manifest, class_hashes):
+    """Keep only the jobs whose class changed since their output was last rendered"""
+    return [job for job in jobs if not is_up_to_date(manifest, job[2], class_hashes[job[1]])]
+
+
+def record_jobs(manifest, jobs, class_hashes):
+    for _, class_id, filename in jobs:
+        manifest[os.path.basename(filename)] = class_hashes[class_id]
+
+
+def render_job(generator, job):
+    """Render one output and write it to disk"""
+    kind, class_id, filename = job
+    if kind == 'html':
+        content = generator.iter_combined_html_timetable(class_ids=[class_id])
+    else:
+        content = generator.generate_markdown_timetable(class_id)
+    write_atomic(filename, content)
+    return filename
+
+
+# Generator held by each worker process, set once by the pool initializer
+_worker_generator = None
+
+
+def _init_worker(generator):
+    global _worker_generator
+    _worker_generator = generator
+
+
+def _render_in_worker(job):
+    return render_job(_worker_generator, job)
+
+
+def render_outputs(generator, jobs, mode='auto', workers=None):
+    """Run render jobs with the given mode, returns the written file names in job order"""
+    if mode == 'auto':
+        mode = 'process' if (os.cpu_count() or 1) > 1 and len(jobs) >= AUTO_MIN_JOBS else 'serial'
+
+    if mode == 'serial' or len(jobs) <= 1:
+        return [render_job(generator, job) for job in jobs]
+
+    if workers is None:
+        workers = min(len(jobs), os.cpu_count() or 1)
+
+    if mode == 'thread':
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(lambda job: render_job(generator, job), jobs))
+
+    if mode == 'process':
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(generator,)) as pool:
+            return list(pool.map(_render_in_worker, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+
+    raise ValueError(f"Unknown render mode {mode}, expected one of {RENDER_MODES}")
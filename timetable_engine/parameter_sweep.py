@@ -0,0 +1,214 @@
+"""
+CP-SAT parameter sweep over benchmark instances
+
+A sweep file describes the instances and the parameter space, for example:
+
+{
+    "instances": [
+        {"name": "department"},
+        {"name": "department-no-saturday", "remove_days": ["Saturday"]},
+        {"name": "faculty", "rooms_file": "faculty_rooms.json", "courses_file": "faculty_courses.json"}
+    ],
+    "grid": {
+        "linearization_level": [0, 1, 2],
+        "num_workers": [1, 8],
+        "search_branching": ["AUTOMATIC_SEARCH", "FIXED_SEARCH", "PORTFOLIO_SEARCH"],
+        "cp_model_presolve": [true, false],
+        "symmetry_level": [0, 2]
+    },
+    "mode": "random",
+    "samples": 20,
+    "seed": 42,
+    "time_limit": 60
+}
+
+Instances accept the same patch keys as scenarios.py plus rooms_file/courses_file.
+With "mode": "grid" every combination is run, with "random" `samples` of them.
+
+Every run records the time to the first solution, the time to optimality (if reached)
+and the final gap. The best configuration of each instance-size bucket (among the runs
+that found a solution) is written to a solver profile that solve_model can load.
+"""
+
+import contextlib
+import io
+import itertools
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from ortools.sat.python import cp_model
+
+from . import scenarios
+
+# Instance-size buckets, by number of model variables (upper bound excluded)
+SIZE_BUCKETS = [
+    ('small', 50000),
+    ('medium', 500000),
+    ('large', None)
+]
+
+
+def size_bucket(num_variables):
+    """Name of the size bucket an instance with `num_variables` model variables falls in"""
+    for name, upper in SIZE_BUCKETS:
+        if upper is None or num_variables < upper:
+            return name
+
+
+def apply_solver_parameters(solver, parameters):
+    """Set CP-SAT parameters from a plain dict (enum values are given by name)"""
+    for name, value in parameters.items():
+        if isinstance(value, str):
+            value = getattr(cp_model, value)
+        setattr(solver.parameters, name, value)
+
+
+def load_solver_profile(profile_file, num_variables):
+    """Parameters recommended for an instance of this size, or an empty dict"""
+    with open(profile_file, 'r', encoding='utf-8') as f:
+        profile = json.load(f)
+
+    return profile.get('buckets', {}).get(size_bucket(num_variables), {}).get('parameters', {})
+
+
+def parameter_configurations(grid, mode='grid', samples=10, seed=0):
+    """Expand the parameter space into a list of configurations"""
+    names = sorted(grid)
+    combinations = [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+    if mode == 'random' and samples < len(combinations):
+        combinations = random.Random(seed).sample(combinations, samples)
+
+    return combinations
+
+
+class FirstSolutionTimer(cp_model.CpSolverSolutionCallback):
+    """Remember when the first solution was found"""
+
+    def __init__(self):
+        cp_model.CpSolverSolutionCallback.__init__(self)
+        self.first_solution_time = None
+
+    def on_solution_callback(self):
+        if self.first_solution_time is None:
+            self.first_solution_time = self.WallTime()
+
+
+def run_configuration(generator_cls, instance, parameters, time_limit, num_workers=0):
+    """Build an instance and solve it once with the generator's solver and the given parameters"""
+    result = {
+        'instance': instance['name'],
+        'parameters': parameters,
+        'status': 'ERROR',
+        'num_variables': None,
+        'bucket': None,
+        'time_to_first_solution': None,
+        'time_to_optimal': None,
+        'objective': None,
+        'best_bound': None,
+        'gap': None,
+        'wall_time': None
+    }
+
+    log = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(log):
+            generator = generator_cls(instance.get('rooms_file', 'data_salles.json'),
+                                      instance.get('courses_file', 'data_cours.json'))
+            scenarios.apply_scenario(generator, instance)
+            generator.build_model()
+
+        solver = generator.create_solver(instance.get('time_limit', time_limit), num_workers)
+        apply_solver_parameters(solver, parameters)
+
+        timer = FirstSolutionTimer()
+        status = solver.Solve(generator.model, timer)
+
+        num_variables = len(generator.model.Proto().variables)
+        result.update({
+            'status': solver.StatusName(status),
+            'num_variables': num_variables,
+            'bucket': size_bucket(num_variables),
+            'time_to_first_solution': timer.first_solution_time,
+            'wall_time': solver.WallTime()
+        })
+
+        if status == cp_model.OPTIMAL or status == cp_model.FEASIBLE:
+            objective = solver.ObjectiveValue()
+            best_bound = solver.BestObjectiveBound()
+            result['objective'] = objective
+            result['best_bound'] = best_bound
+            result['gap'] = abs(objective - best_bound) / max(1.0, abs(objective))
+        if status == cp_model.OPTIMAL:
+            result['time_to_optimal'] = solver.WallTime()
+    except Exception as exc:
+        result['status'] = f"ERROR: {exc}"
+
+    return result
+
+
+def run_sweep(generator_cls, sweep, workers=None):
+    """Run every (instance, configuration) pair of a sweep in a process pool"""
+    configurations = parameter_configurations(sweep['grid'], sweep.get('mode', 'grid'),
+                                              sweep.get('samples', 10), sweep.get('seed', 0))
+    instances = sweep['instances']
+    for idx, instance in enumerate(instances):
+        instance.setdefault('name', f"instance-{idx + 1}")
+
+    runs = [(instance, parameters) for instance in instances for parameters in configurations]
+    if workers is None:
+        workers = min(len(runs), os.cpu_count() or 1)
+    workers = max(1, workers)
+
+    # Share the cores between the processes, unless a configuration sets num_workers itself
+    solver_workers = max(1, (os.cpu_count() or 1) // workers)
+
+    time_limit = sweep.get('time_limit', 60)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_configuration, generator_cls, instance, parameters, time_limit, solver_workers)
+                   for instance, parameters in runs]
+        return [future.result() for future in futures]
+
+
+def run_score(result, time_limit):
+    """Sort key of a run: optimal first, then fastest to optimal, smallest gap, fastest first solution"""
+    unsolved = time_limit * 10
+    return (
+        result['time_to_optimal'] is None,
+        result['time_to_optimal'] if result['time_to_optimal'] is not None else unsolved,
+        result['gap'] if result['gap'] is not None else float('inf'),
+        result['time_to_first_solution'] if result['time_to_first_solution'] is not None else unsolved
+    )
+
+
+def recommend_profile(results, time_limit):
+    """Pick, per size bucket, the configuration with the best average rank across its instances
+
+    Only runs that found a solution are ranked, a bucket where none did is left out of
+    the profile.
+    """
+    ranks = {}
+    for instance in sorted(set(result['instance'] for result in results)):
+        runs = [result for result in results
+                if result['instance'] == instance and result['bucket'] and result['objective'] is not None]
+        runs.sort(key=lambda result: run_score(result, time_limit))
+        for rank, result in enumerate(runs):
+            key = (result['bucket'], json.dumps(result['parameters'], sort_keys=True))
+            ranks.setdefault(key, []).append(rank)
+
+    profile = {'generated_at': time.strftime('%Y-%m-%d %H:%M:%S'), 'buckets': {}}
+    for name, upper in SIZE_BUCKETS:
+        candidates = [(sum(r) / len(r), parameters) for (bucket, parameters), r in ranks.items() if bucket == name]
+        if not candidates:
+            continue
+        mean_rank, parameters = min(candidates)
+        profile['buckets'][name] = {
+            'max_variables': upper,
+            'mean_rank': mean_rank,
+            'parameters': json.loads(parameters)
+        }
+
+    return profile
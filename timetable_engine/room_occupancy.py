@@ -0,0 +1,90 @@
+"""
+Room occupancy bitmap of a solved timetable, for free-room and free-slot lookups
+
+The solved timetable is turned once into a rooms x days x periods boolean array, and
+the rooms are kept sorted by capacity. A query such as "which rooms are free on
+Thursday 10:05am - 12:55pm with at least 100 seats" is then a binary search in the
+capacities plus one indexed read of the bitmap, without going back to the class grids.
+
+    occupancy = RoomOccupancy.from_timetable(generator.timetable, generator.rooms,
+                                             generator.days, generator.periods)
+    occupancy.free_rooms('Thursday', '10:05am - 12:55pm', min_capacity=100)
+    occupancy.free_slots(room='A250')
+"""
+
+import numpy as np
+
+
+class RoomOccupancy:
+    def __init__(self, rooms, days, periods):
+        self.rooms = rooms
+        self.days = days
+        self.periods = periods
+        self.occupied = np.zeros((len(rooms), len(days), len(periods)), dtype=bool)
+
+        # Rooms sorted by capacity, so "capacity >= n" is a suffix of this order
+        capacities = np.array([room['capacity'] for room in rooms], dtype=np.int64)
+        self.by_capacity = np.argsort(capacities, kind='stable')
+        self.sorted_capacities = capacities[self.by_capacity]
+
+        self.room_index = {}
+        for room_idx, room in enumerate(rooms):
+            self.room_index[(room['building'], room['num'])] = room_idx
+            self.room_index.setdefault(room['num'], room_idx)
+
+    @classmethod
+    def from_timetable(cls, timetable, rooms, days, periods):
+        """Mark every room used by a class -> day -> period grid of cells"""
+        occupancy = cls(rooms, days, periods)
+        for grid in timetable.values():
+            for day_idx, row in enumerate(grid):
+                for period_idx, cell in enumerate(row):
+                    if cell:
+                        room_idx = occupancy.room_index.get((cell['building'], cell['room']))
+                        if room_idx is not None:
+                            occupancy.occupied[room_idx, day_idx, period_idx] = True
+        return occupancy
+
+    def day_index(self, day):
+        """Index of a day given by index or by name (case-insensitive)"""
+        if isinstance(day, int):
+            return day
+        names = [name.lower() for name in self.days]
+        if day.lower() not in names:
+            raise ValueError(f"Unknown day {day}, expected one of {self.days}")
+        return names.index(day.lower())
+
+    def period_index(self, period):
+        """Index of a period given by index or by its label, e.g. '10:05am - 12:55pm'"""
+        if isinstance(period, int):
+            if not 0 <= period < len(self.periods):
+                raise ValueError(f"Unknown period index {period}, expected 0 to {len(self.periods) - 1}")
+            return period
+        labels = [label.replace(' ', '').lower() for label in self.periods]
+        if period.replace(' ', '').lower() not in labels:
+            raise ValueError(f"Unknown period {period}, expected one of {self.periods}")
+        return labels.index(period.replace(' ', '').lower())
+
+    def rooms_with_capacity(self, min_capacity=0):
+        """Indexes of the rooms with at least `min_capacity` seats, smallest first"""
+        return self.by_capacity[np.searchsorted(self.sorted_capacities, min_capacity, side='left'):]
+
+    def free_rooms(self, day, period, min_capacity=0):
+        """Rooms free at a given slot with at least `min_capacity` seats, smallest first"""
+        candidates = self.rooms_with_capacity(min_capacity)
+        free = candidates[~self.occupied[candidates, self.day_index(day), self.period_index(period)]]
+        return [self.rooms[room_idx] for room_idx in free]
+
+    def free_slots(self, room=None, min_capacity=0):
+        """(day, period) slots where `room` is free, or where any room with enough seats is free"""
+        if room is not None:
+            if room not in self.room_index:
+                raise ValueError(f"Unknown room {room}")
+            free = ~self.occupied[self.room_index[room]]
+        else:
+            free = (~self.occupied[self.rooms_with_capacity(min_capacity)]).any(axis=0)
+        return [(self.days[day_idx], self.periods[period_idx]) for day_idx, period_idx in np.argwhere(free)]
+
+    def occupancy_rate(self):
+        """Share of the room slots in use"""
+        return float(self.occupied.mean()) if self.occupied.size else 0.0
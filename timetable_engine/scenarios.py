@@ -0,0 +1,165 @@
+"""
+What-if scenario runner for the timetable generator
+
+A scenario file is a JSON list of patches applied on top of the room/course data
+and the day/period/weight constants, for example:
+
+[
+    {"name": "baseline"},
+    {"name": "A250 closed", "remove_rooms": ["A250"]},
+    {"name": "no Saturday", "remove_days": ["Saturday"]},
+    {"name": "short days", "periods": ["7:00am - 9:55am", "10:05am - 12:55pm", "1:05pm - 3:55pm"],
+     "period_weights": [1, 2, 3], "time_limit": 60}
+]
+
+Supported keys:
+- name: label used in the comparison table
+- remove_rooms / add_rooms: room numbers to drop, rooms to add (same fields as data_salles.json)
+- remove_courses: course codes to drop from every class
+- remove_days / days: days to drop, or the full list of days
+- periods / period_weights: replacement period labels and their weights
+- time_limit: solver time budget for this scenario only
+
+Each scenario is built and solved in its own process.
+"""
+
+import contextlib
+import io
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+
+def load_scenarios(scenario_file):
+    """Read a list of scenario patches from a JSON file"""
+    with open(scenario_file, 'r', encoding='utf-8') as f:
+        scenarios = json.load(f)
+
+    # Give unnamed scenarios a stable label
+    for idx, scenario in enumerate(scenarios):
+        scenario.setdefault('name', f"scenario-{idx + 1}")
+
+    return scenarios
+
+
+def apply_scenario(generator, scenario):
+    """Patch a freshly loaded generator in place, before build_model is called"""
+
+    # Rooms
+    removed_rooms = set(scenario.get('remove_rooms', []))
+    generator.rooms = [room for room in generator.rooms if room['num'] not in removed_rooms]
+    for room in scenario.get('add_rooms', []):
+        generator.rooms.append({
+            'num': room['num'],
+            'capacity': int(room['capacite']),
+            'building': room['batiment'],
+            'filiere': room['filier']
+        })
+
+    # Courses
+    removed_courses = set(scenario.get('remove_courses', []))
+    if removed_courses:
+        for class_id in generator.classes:
+            generator.all_courses[class_id] = [course for course in generator.all_courses[class_id]
+                                               if course['code'] not in removed_courses]
+
+    # Days, periods and weights
+    if 'days' in scenario:
+        generator.days = list(scenario['days'])
+    removed_days = set(scenario.get('remove_days', []))
+    generator.days = [day for day in generator.days if day not in removed_days]
+
+    if 'periods' in scenario:
+        generator.periods = list(scenario['periods'])
+    if 'period_weights' in scenario:
+        generator.period_weights = list(scenario['period_weights'])
+
+    if len(generator.period_weights) != len(generator.periods):
+        raise ValueError(f"Scenario {scenario['name']}: {len(generator.periods)} periods "
+                         f"but {len(generator.period_weights)} period weights")
+
+
+def solve_scenario(generator_cls, rooms_file, courses_file, scenario, time_limit, num_workers):
+    """Build and solve one scenario, returning a row of the comparison table"""
+    start = time.time()
+    result = {
+        'name': scenario['name'],
+        'status': 'ERROR',
+        'feasible': False,
+        'objective': None,
+        'best_bound': None,
+        'solve_time': None,
+        'total_time': None,
+        'rooms': None,
+        'days': None,
+        'courses': None
+    }
+
+    # The generator is chatty, keep the worker output out of the batch report
+    log = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(log):
+            generator = generator_cls(rooms_file, courses_file)
+            apply_scenario(generator, scenario)
+            generator.build_model()
+            feasible = generator.solve_model(time_limit=scenario.get('time_limit', time_limit),
+                                             num_workers=num_workers)
+
+        result.update({
+            'status': generator.solution_info['status'],
+            'feasible': feasible,
+            'objective': generator.solution_info['objective'],
+            'best_bound': generator.solution_info['best_bound'],
+            'solve_time': generator.solution_info['wall_time'],
+            'rooms': len(generator.rooms),
+            'days': len(generator.days),
+            'courses': sum(len(courses) for courses in generator.all_courses.values())
+        })
+    except Exception as exc:
+        result['status'] = f"ERROR: {exc}"
+
+    result['total_time'] = time.time() - start
+    return result
+
+
+def run_scenarios(generator_cls, rooms_file, courses_file, scenarios, time_limit=300, workers=None):
+    """Solve every scenario in a process pool, results come back in input order"""
+    if workers is None:
+        workers = min(len(scenarios), os.cpu_count() or 1)
+    workers = max(1, workers)
+
+    # Share the cores between the processes instead of letting every solver grab all of them
+    solver_workers = max(1, (os.cpu_count() or 1) // workers)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(solve_scenario, generator_cls, rooms_file, courses_file,
+                               scenario, time_limit, solver_workers)
+                   for scenario in scenarios]
+        return [future.result() for future in futures]
+
+
+def format_comparison_table(results):
+    """Render scenario results as a plain-text table"""
+    headers = ['Scenario', 'Status', 'Feasible', 'Objective', 'Bound', 'Solve (s)', 'Rooms', 'Days', 'Courses']
+    rows = []
+    for result in results:
+        rows.append([
+            result['name'],
+            result['status'],
+            'yes' if result['feasible'] else 'no',
+            '-' if result['objective'] is None else f"{result['objective']:g}",
+            '-' if result['best_bound'] is None else f"{result['best_bound']:g}",
+            '-' if result['solve_time'] is None else f"{result['solve_time']:.1f}",
+            '-' if result['rooms'] is None else str(result['rooms']),
+            '-' if result['days'] is None else str(result['days']),
+            '-' if result['courses'] is None else str(result['courses'])
+        ])
+
+    widths = [max(len(str(row[col])) for row in [headers] + rows) for col in range(len(headers))]
+    lines = [' | '.join(cell.ljust(width) for cell, width in zip(headers, widths)),
+             '-+-'.join('-' * width for width in widths)]
+    for row in rows:
+        lines.append(' | '.join(cell.ljust(width) for cell, width in zip(row, widths)))
+
+    return '\n'.join(lines)
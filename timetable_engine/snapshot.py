@@ -0,0 +1,231 @@
+"""
+Normalized binary snapshot of the rooms and courses files
+
+load_rooms and load_courses parse both JSON documents, clean every subject up and
+build one dict per course. The snapshot stores their result once, in a compact form:
+
+- one table of interned strings (room numbers, buildings, course names and codes,
+  lecturers, class ids), every other column refers to it by integer id
+- array-backed columns for the rooms (num, capacity, building, filiere), the lecturers
+  (name), the classes (id and offset of their first course), the courses (name,
+  code, lecturer, credits), the availability (lecturer, day, period bitmask) and the
+  lecturer load limits (lecturer, max daily sessions, max consecutive periods, -1 if none)
+
+It is written with marshal next to the courses file (data_cours.json ->
+data_cours.snapshot) and reused as long as both source files are unchanged: same
+size and modification time, or, when these changed, the same SHA-256. The snapshot
+is rebuilt when the Python version or SNAPSHOT_VERSION changes.
+
+    rooms, classes, all_courses, availability, lecturer_limits = load_inputs('data_salles.json',
+                                                                             'data_cours.json')
+"""
+
+import hashlib
+import marshal
+import os
+import sys
+from array import array
+
+from .data import LECTURER_LIMITS, load_courses, load_rooms
+from .parallel_render import write_atomic
+
+# Bump when the layout of the snapshot changes
+SNAPSHOT_VERSION = 3
+
+MAGIC = b'TTSNAP'
+
+
+def snapshot_path(courses_file):
+    """Snapshot file of a courses file, in the same directory"""
+    return os.path.splitext(courses_file)[0] + '.snapshot'
+
+
+def file_signature(path):
+    """(size, mtime_ns) of a file, a cheap change check"""
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class Snapshot:
+    """String table plus integer columns of the rooms, lecturers, classes, courses, availability and limits"""
+
+    def __init__(self):
+        self.strings = []
+        self.string_ids = {}
+        self.room_num = array('i')
+        self.room_capacity = array('q')
+        self.room_building = array('i')
+        self.room_filiere = array('i')
+        self.lecturer_name = array('i')
+        self.class_name = array('i')
+        self.class_start = array('i', [0])  # courses of class i are class_start[i]:class_start[i + 1]
+        self.course_name = array('i')
+        self.course_code = array('i')
+        self.course_lecturer = array('i')
+        self.course_credits = []
+        self.availability_lecturer = array('i')
+        self.availability_day = array('i')
+        self.availability_mask = []
+        self.limits_lecturer = array('i')
+        self.limits_max_daily_sessions = array('i')
+        self.limits_max_consecutive_periods = array('i')
+
+    def intern(self, value):
+        """Id of a string (or any other JSON scalar) in the string table"""
+        string_id = self.string_ids.get(value)
+        if string_id is None:
+            string_id = self.string_ids[value] = len(self.strings)
+            self.strings.append(sys.intern(value) if isinstance(value, str) else value)
+        return string_id
+
+    @classmethod
+    def from_inputs(cls, rooms, classes, all_courses, availability, lecturer_limits):
+        """Normalize the output of load_rooms and load_courses"""
+        snapshot = cls()
+        for room in rooms:
+            snapshot.room_num.append(snapshot.intern(room['num']))
+            snapshot.room_capacity.append(room['capacity'])
+            snapshot.room_building.append(snapshot.intern(room['building']))
+            snapshot.room_filiere.append(snapshot.intern(room['filiere']))
+
+        lecturer_ids = {}
+        for class_id in classes:
+            snapshot.class_name.append(snapshot.intern(class_id))
+            for course in all_courses[class_id]:
+                lecturer_id = lecturer_ids.get(course['teacher'])
+                if lecturer_id is None:
+                    lecturer_id = lecturer_ids[course['teacher']] = len(snapshot.lecturer_name)
+                    snapshot.lecturer_name.append(snapshot.intern(course['teacher']))
+                snapshot.course_name.append(snapshot.intern(course['name']))
+                snapshot.course_code.append(snapshot.intern(course['code']))
+                snapshot.course_lecturer.append(lecturer_id)
+                snapshot.course_credits.append(course['credits'])
+            snapshot.class_start.append(len(snapshot.course_name))
+
+        for lecturer, day_masks in availability.items():
+            for day, mask in day_masks.items():
+                snapshot.availability_lecturer.append(snapshot.intern(lecturer))
+                snapshot.availability_day.append(snapshot.intern(day))
+                snapshot.availability_mask.append(mask)
+
+        for lecturer, limits in lecturer_limits.items():
+            snapshot.limits_lecturer.append(snapshot.intern(lecturer))
+            for name in LECTURER_LIMITS:
+                getattr(snapshot, f"limits_{name}").append(limits.get(name, -1))
+        return snapshot
+
+    def to_inputs(self):
+        """Rooms, classes, courses, availability and limits in the form returned by load_rooms and load_courses"""
+        strings = self.strings
+        rooms = [{'num': strings[num], 'capacity': capacity, 'building': strings[building],
+                  'filiere': strings[filiere]}
+                 for num, capacity, building, filiere in zip(self.room_num, self.room_capacity,
+                                                             self.room_building, self.room_filiere)]
+
+        lecturers = [strings[name] for name in self.lecturer_name]
+        courses = [{'name': strings[name], 'code': strings[code], 'teacher': lecturers[lecturer],
+                    'credits': credits}
+                   for name, code, lecturer, credits in zip(self.course_name, self.course_code,
+                                                            self.course_lecturer, self.course_credits)]
+
+        classes = [strings[name] for name in self.class_name]
+        all_courses = {class_id: courses[self.class_start[idx]:self.class_start[idx + 1]]
+                       for idx, class_id in enumerate(classes)}
+
+        availability = {}
+        for lecturer, day, mask in zip(self.availability_lecturer, self.availability_day, self.availability_mask):
+            availability.setdefault(strings[lecturer], {})[strings[day]] = mask
+
+        lecturer_limits = {}
+        for idx, lecturer in enumerate(self.limits_lecturer):
+            values = {name: getattr(self, f"limits_{name}")[idx] for name in LECTURER_LIMITS}
+            lecturer_limits[strings[lecturer]] = {name: value for name, value in values.items() if value >= 0}
+        return rooms, classes, all_courses, availability, lecturer_limits
+
+    COLUMNS = ['room_num', 'room_capacity', 'room_building', 'room_filiere', 'lecturer_name',
+               'class_name', 'class_start', 'course_name', 'course_code', 'course_lecturer',
+               'availability_lecturer', 'availability_day', 'limits_lecturer', 'limits_max_daily_sessions',
+               'limits_max_consecutive_periods']
+
+    def dumps(self, sources):
+        """Binary form of the snapshot, `sources` identifies the files it was built from"""
+        payload = {
+            'version': SNAPSHOT_VERSION,
+            'sources': sources,
+            'strings': tuple(self.strings),
+            'columns': {name: (getattr(self, name).typecode, getattr(self, name).tobytes())
+                        for name in self.COLUMNS},
+            'credits': tuple(self.course_credits),
+            'availability': tuple(self.availability_mask)
+        }
+        return MAGIC + bytes([marshal.version]) + marshal.dumps(payload)
+
+    @classmethod
+    def loads(cls, data):
+        """Snapshot and sources of a binary snapshot, or (None, None) if it cannot be read"""
+        header = MAGIC + bytes([marshal.version])
+        if not data.startswith(header):
+            return None, None
+        try:
+            payload = marshal.loads(data[len(header):])
+        except (EOFError, ValueError, TypeError):
+            return None, None
+        if not isinstance(payload, dict) or payload.get('version') != SNAPSHOT_VERSION:
+            return None, None
+
+        snapshot = cls()
+        snapshot.strings = list(payload['strings'])
+        for name, (typecode, raw) in payload['columns'].items():
+            column = array(typecode)
+            column.frombytes(raw)
+            setattr(snapshot, name, column)
+        snapshot.course_credits = list(payload['credits'])
+        snapshot.availability_mask = list(payload['availability'])
+        return snapshot, payload['sources']
+
+
+def load_inputs(rooms_file, courses_file, snapshot_file=None):
+    """Rooms, classes, courses, availability and limits, read from the snapshot when the sources did not change"""
+    if snapshot_file is None:
+        snapshot_file = snapshot_path(courses_file)
+    paths = [rooms_file, courses_file]
+    signatures = [file_signature(path) for path in paths]
+
+    snapshot = sources = None
+    if os.path.exists(snapshot_file):
+        with open(snapshot_file, 'rb') as f:
+            snapshot, sources = Snapshot.loads(f.read())
+
+    if snapshot is not None:
+        if [source[:2] for source in sources] == signatures:
+            return snapshot.to_inputs()
+        # Touched or copied files keep their snapshot if their content is the same
+        hashes = [file_hash(path) for path in paths]
+        if [source[2] for source in sources] == hashes:
+            save_snapshot(snapshot_file, snapshot, signatures, hashes)
+            return snapshot.to_inputs()
+    else:
+        hashes = [file_hash(path) for path in paths]
+
+    rooms = load_rooms(rooms_file)
+    classes, all_courses, availability, lecturer_limits = load_courses(courses_file)
+    save_snapshot(snapshot_file, Snapshot.from_inputs(rooms, classes, all_courses, availability, lecturer_limits),
+                  signatures, hashes)
+    return rooms, classes, all_courses, availability, lecturer_limits
+
+
+def save_snapshot(snapshot_file, snapshot, signatures, hashes):
+    """Write a snapshot, a read-only input directory only costs the cache"""
+    sources = [signature + [digest] for signature, digest in zip(signatures, hashes)]
+    try:
+        write_atomic(snapshot_file, snapshot.dumps(sources))
+    except OSError:
+        pass
@@ -0,0 +1,96 @@
+"""
+CP-SAT solution callbacks of the generator
+
+Kept apart from the generator script so ortools is only imported when a model is solved.
+"""
+
+import threading
+import time
+
+from ortools.sat.python import cp_model
+
+
+class CheckpointCallback(cp_model.CpSolverSolutionCallback):
+    """Persist the best assignment found so far while the solver is running
+
+    The first solution is saved at once. Later ones, and the time spent, are saved every
+    `interval` seconds by a background thread, so a kill loses at most `interval` seconds
+    of search even when no better solution has come in since the last write.
+    """
+
+    def __init__(self, generator, checkpoint_file, interval, elapsed_before=0.0):
+        cp_model.CpSolverSolutionCallback.__init__(self)
+        self.generator = generator
+        self.checkpoint_file = checkpoint_file
+        self.interval = interval
+        self.elapsed_before = elapsed_before
+        self.last_save = None
+        self.pending = None
+        self.started = time.monotonic()
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+
+    def on_solution_callback(self):
+        # Snapshot the assignment now, the values are only readable inside the callback
+        assigned = [list(var_key) for var_key in self.generator.solution_assignments(self.Value)]
+        with self.lock:
+            self.pending = (assigned, self.ObjectiveValue(), self.BestObjectiveBound())
+        if self.last_save is None:
+            self.flush('FEASIBLE')
+
+    def solve(self, solver, model):
+        self.started = time.monotonic()
+        thread = threading.Thread(target=self.flush_periodically, daemon=True)
+        thread.start()
+        try:
+            return solver.Solve(model, self)
+        finally:
+            self.stopped.set()
+            thread.join()
+
+    def flush_periodically(self):
+        while not self.stopped.wait(self.interval):
+            self.flush('FEASIBLE')
+
+    def flush(self, status, wall_time=None):
+        with self.lock:
+            if self.pending is None:
+                return
+            assigned, objective, best_bound = self.pending
+            if wall_time is None:
+                wall_time = time.monotonic() - self.started
+            self.generator.save_checkpoint(self.checkpoint_file, assigned, objective, best_bound,
+                                           self.elapsed_before + wall_time, status)
+            self.last_save = wall_time
+
+
+class FirstSolutionDeadline(cp_model.CpSolverSolutionCallback):
+    """Stop the search after `deadline` seconds, but not before a first solution is found
+
+    The solver's own time limit is the hard cap, the deadline only ends the search early
+    once there is a solution to keep.
+    """
+
+    def __init__(self, solver, deadline):
+        cp_model.CpSolverSolutionCallback.__init__(self)
+        self.solver = solver
+        self.deadline = deadline
+        self.found = False
+        self.timer = threading.Timer(deadline, self.stop_if_found)
+        self.timer.daemon = True
+
+    def on_solution_callback(self):
+        self.found = True
+        if self.WallTime() >= self.deadline:
+            self.StopSearch()
+
+    def stop_if_found(self):
+        if self.found:
+            self.solver.StopSearch()
+
+    def solve(self, model):
+        self.timer.start()
+        try:
+            return self.solver.Solve(model, self)
+        finally:
+            self.timer.cancel()
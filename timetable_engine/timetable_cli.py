@@ -0,0 +1,467 @@
+"""
+Command line interface of the timetable generator
+
+    python timetable-generator-V3.py solve --time-limit 120 --views
+    python timetable-generator-V3.py render --output-format both      # from timetable.json, no solving
+    python timetable-generator-V3.py validate timetable.json
+    python timetable-generator-V3.py stats
+    python timetable-generator-V3.py free-rooms --day Thursday --period 2 --min-capacity 100
+    python timetable-generator-V3.py free-slots --room A250
+
+Without a subcommand the generator solves, so the solve options (and the older
+--validate, --scenarios and --sweep switches) are also accepted at the top level.
+
+This module and the generator only import the standard library and the rendering
+helpers when they are loaded. ortools, pandas and NumPy are imported by the commands
+that use them, so `--help` or re-rendering a saved timetable does not pay for them
+(see benchmarks/bench_startup.py).
+"""
+
+import argparse
+import datetime
+import functools
+import json
+import time
+
+from . import compact_payload
+from . import ical_export
+from . import parallel_render
+from . import timetable_store
+from .formulations import FORMULATIONS
+from .generator import LEXICOGRAPHIC_OBJECTIVES, check_table_export
+
+ROOMS_FILE = 'data_salles.json'
+COURSES_FILE = 'data_cours.json'
+
+
+def add_limit_arguments(parser):
+    parser.add_argument('--max-daily-sessions', type=int, default=None,
+                        help="most sessions a lecturer teaches on one day (default: no limit)")
+    parser.add_argument('--max-consecutive-periods', type=int, default=None,
+                        help="most consecutive periods a lecturer teaches (default: no limit)")
+
+
+def objective_list(value):
+    """Comma-separated --lexicographic objectives, checked when the options are parsed"""
+    names = value.split(',')
+    unknown = [name for name in names if name not in LEXICOGRAPHIC_OBJECTIVES]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown objectives {', '.join(unknown)}, "
+                                         f"expected some of {', '.join(LEXICOGRAPHIC_OBJECTIVES)}")
+    return names
+
+
+def add_solve_arguments(parser):
+    parser.add_argument('--time-limit', type=float, default=300,
+                        help="total solver time budget in seconds, shared across resumed runs")
+    parser.add_argument('--checkpoint', default='timetable_checkpoint.json',
+                        help="file where the best solution is periodically saved")
+    parser.add_argument('--checkpoint-interval', type=float, default=30,
+                        help="seconds between two checkpoint writes (best solution and time spent)")
+    parser.add_argument('--resume', action='store_true',
+                        help="continue from the checkpoint with the remaining time budget")
+    parser.add_argument('--lexicographic', type=objective_list,
+                        help="comma-separated objectives solved one after the other, e.g. "
+                             "periods,compact_days,building_changes,lecturer_load (or idle_gaps)")
+    parser.add_argument('--solver-profile',
+                        help="solver parameter profile produced by --sweep")
+    parser.add_argument('--formulation', choices=sorted(FORMULATIONS), default=None,
+                        help="objective formulation (default: the generator's own)")
+    parser.add_argument('--idle-gap-weight', type=int, default=0,
+                        help="also minimize the idle periods of the classes, each one weighing this much "
+                             "against the period weights (default: 0, off)")
+    add_limit_arguments(parser)
+    parser.add_argument('--scenarios',
+                        help="JSON file of what-if scenarios to solve in parallel instead of a single run")
+    parser.add_argument('--scenario-workers', type=int, default=None,
+                        help="number of scenarios solved at the same time (default: one per core)")
+    parser.add_argument('--scenario-report', default='scenario_comparison.json',
+                        help="where to save the scenario comparison table")
+    parser.add_argument('--sweep',
+                        help="JSON file describing a solver parameter sweep over benchmark instances")
+    parser.add_argument('--sweep-workers', type=int, default=None,
+                        help="number of sweep runs executed at the same time (default: one per core)")
+    parser.add_argument('--sweep-output', default='sweep_results.json',
+                        help="where to save the raw sweep measurements")
+    parser.add_argument('--sweep-profile', default='solver_profile.json',
+                        help="where to save the recommended solver profile")
+
+
+def add_output_arguments(parser):
+    parser.add_argument('--render-mode', choices=['auto'] + parallel_render.RENDER_MODES, default='auto',
+                        help="how the per-class HTML and Markdown files are rendered")
+    parser.add_argument('--render-workers', type=int, default=None,
+                        help="size of the rendering pool (default: one per core)")
+    parser.add_argument('--output-format', choices=['html', 'compact', 'both'], default='html',
+                        help="pre-rendered combined page, compact JSON data with a client-side viewer, or both")
+    parser.add_argument('--views', action='store_true',
+                        help="also write the per-teacher and per-room timetables (teacher_timetables/room_timetables .html and .md)")
+    parser.add_argument('--export-table',
+                        help="also save one row per session as Parquet (.parquet) or Feather (.feather, .arrow)")
+    parser.add_argument('--ics',
+                        help="directory where one iCalendar file per class, lecturer and room is written")
+    parser.add_argument('--ics-start', type=datetime.date.fromisoformat, default=None,
+                        help="first day of the term for the calendars, YYYY-MM-DD (default: today)")
+    parser.add_argument('--ics-weeks', type=int, default=15,
+                        help="number of weeks the calendar events repeat")
+    parser.add_argument('--db',
+                        help="SQLite database where the timetable is stored as a new version")
+    parser.add_argument('--force-render', action='store_true',
+                        help="re-render every output even if its timetable did not change")
+
+
+def option_parser(add_arguments, command=False):
+    """Parent parser of a group of options
+
+    The solve and output options are accepted both before and after the command. The
+    copies used by the commands get no defaults, so an option given before the command
+    keeps its value unless it is given again after it.
+    """
+    parser = argparse.ArgumentParser(add_help=False)
+    add_arguments(parser)
+    if command:
+        suppress_defaults(parser)
+    return parser
+
+
+def suppress_defaults(parser):
+    for action in parser._actions:
+        if action.option_strings:
+            action.default = argparse.SUPPRESS
+    return parser
+
+
+def build_parser():
+    solve_options = option_parser(add_solve_arguments)
+    output_options = option_parser(add_output_arguments)
+    command_solve_options = option_parser(add_solve_arguments, command=True)
+    command_output_options = option_parser(add_output_arguments, command=True)
+    timetable_options = argparse.ArgumentParser(add_help=False)
+    timetable_options.add_argument('--timetable', default='timetable.json',
+                                   help="saved timetable (as written by solve)")
+
+    parser = argparse.ArgumentParser(description="Generate the department timetables",
+                                     parents=[solve_options, output_options])
+    parser.add_argument('--validate',
+                        help="check a timetable JSON file (same as the validate command) and exit")
+
+    commands = parser.add_subparsers(dest='command')
+    commands.add_parser('solve', parents=[command_solve_options, command_output_options],
+                        help="build and solve the model, then write every output (default)")
+    commands.add_parser('render', parents=[timetable_options, command_output_options],
+                        help="write the outputs of a saved timetable without solving")
+    validate = commands.add_parser('validate', help="check the hard constraints of a timetable JSON file")
+    validate.add_argument('timetable_file', help="timetable to check, e.g. a hand-edited timetable.json")
+    validate.add_argument('--formulation', choices=sorted(FORMULATIONS), default=None,
+                          help="formulation the timetable was solved with, sets the expected weekly sessions")
+    add_limit_arguments(validate)
+    suppress_defaults(validate)
+    commands.add_parser('stats', parents=[timetable_options],
+                        help="compute the utilization and load statistics of a saved timetable")
+
+    # Lookups on a saved timetable
+    free_rooms = commands.add_parser('free-rooms', parents=[timetable_options],
+                                     help="list the rooms free at a given slot")
+    free_rooms.add_argument('--day', required=True, help="day name, e.g. Thursday")
+    free_rooms.add_argument('--period', required=True,
+                            help="period label (e.g. '10:05am - 12:55pm') or number (1 = first period)")
+    free_slots = commands.add_parser('free-slots', parents=[timetable_options],
+                                     help="list the slots where a room (or any large enough room) is free")
+    free_slots.add_argument('--room', help="room number, e.g. A250")
+    for command in (free_rooms, free_slots):
+        command.add_argument('--min-capacity', type=int, default=0, help="minimum number of seats")
+
+    return parser
+
+
+def load_solved_generator(generator_cls, timetable_file):
+    """Generator holding a saved timetable and its inverted indexes
+
+    Exits with the list of problems when cells of a hand-edited timetable cannot be read.
+    """
+    from . import timetable_validator
+
+    generator = generator_cls(ROOMS_FILE, COURSES_FILE)
+    with open(timetable_file, 'r', encoding='utf-8') as f:
+        generator.timetable = json.load(f)
+    problems = timetable_validator.structure_violations(generator.timetable, generator.classes, generator.all_courses,
+                                                        generator.rooms, generator.days, generator.periods)
+    if problems:
+        print(timetable_validator.format_violations(problems))
+        raise SystemExit(f"{timetable_file} cannot be read, fix it and check it with: validate {timetable_file}")
+    generator.build_indexes()
+    return generator
+
+
+def write_statistics(generator):
+    """Save the utilization and load statistics as JSON and as an HTML page"""
+    from . import timetable_stats
+
+    stats = generator.compute_statistics()
+    parallel_render.write_atomic("timetable_stats.json", json.dumps(stats, indent=2, ensure_ascii=False))
+    parallel_render.write_atomic("timetable_stats.html",
+                                 timetable_stats.iter_stats_html(stats, generator.days, generator.periods))
+    print(f"Room utilization {stats['rooms']['utilization']:.0%}, max lecturer daily load "
+          f"{stats['lecturers']['max_daily_load']}, {stats['classes']['idle_gaps']} class idle gaps")
+    print("Saved timetable_stats.json and timetable_stats.html")
+
+
+def write_outputs(generator, args):
+    """Render and export a solved timetable according to the output options"""
+    # Only outputs whose class changed since the last run are rendered again
+    manifest = {} if args.force_render else parallel_render.load_manifest()
+    class_hashes = {class_id: parallel_render.class_content_hash(generator, class_id)
+                    for class_id in generator.classes}
+    combined_hash = parallel_render.combined_content_hash(class_hashes)
+
+    # Compact data file plus a static viewer rendering it in the browser
+    if args.output_format in ('compact', 'both'):
+        if parallel_render.is_up_to_date(manifest, "timetable_data.json", combined_hash):
+            print("timetable_data.json is up to date")
+        else:
+            parallel_render.write_atomic("timetable_data.json",
+                                         compact_payload.dump_payload(compact_payload.build_payload(generator)))
+            manifest["timetable_data.json"] = combined_hash
+            print("Saved timetable_data.json")
+
+        viewer_hash = parallel_render.static_content_hash("timetable_viewer.html")
+        if not parallel_render.is_up_to_date(manifest, "timetable_viewer.html", viewer_hash):
+            parallel_render.write_atomic("timetable_viewer.html", compact_payload.iter_viewer_html("timetable_data.json"))
+            manifest["timetable_viewer.html"] = viewer_hash
+            print("Saved timetable_viewer.html")
+
+    # Stream the combined HTML timetable with all schedules to disk
+    if args.output_format in ('html', 'both'):
+        if parallel_render.is_up_to_date(manifest, "all_timetables.html", combined_hash):
+            print("all_timetables.html is up to date")
+        else:
+            print("Generating combined timetable...")
+            parallel_render.write_atomic("all_timetables.html", generator.iter_combined_html_timetable())
+            manifest["all_timetables.html"] = combined_hash
+            print("Saved all_timetables.html")
+
+    # Teacher and room views, rendered from the inverted indexes of process_solution
+    if args.views:
+        for view in ('teacher', 'room'):
+            for filename, render in ((f"{view}_timetables.html", generator.iter_view_html_timetable),
+                                     (f"{view}_timetables.md", generator.generate_view_markdown)):
+                if parallel_render.is_up_to_date(manifest, filename, combined_hash):
+                    print(f"{filename} is up to date")
+                    continue
+                parallel_render.write_atomic(filename, render(view))
+                manifest[filename] = combined_hash
+                print(f"Saved {filename}")
+
+    # Columnar session table for the analytics tools
+    if args.export_table:
+        generator.export_timetable_table(args.export_table)
+        print(f"Saved {args.export_table}")
+
+    # Weekly recurring calendar events for students, lecturers and rooms
+    if args.ics:
+        calendars = ical_export.export_calendars(generator, args.ics, start_date=args.ics_start, weeks=args.ics_weeks)
+        print(f"Saved {len(calendars)} calendars to {args.ics}")
+
+    # Keep the history of solved timetables in SQLite
+    if args.db:
+        conn = timetable_store.connect(args.db)
+        try:
+            version_id = timetable_store.save_timetable(conn, generator,
+                                                        solution_info=getattr(generator, 'solution_info', None))
+        finally:
+            conn.close()
+        print(f"Saved timetable version {version_id} to {args.db}")
+
+    # Also save individual HTML and markdown versions, rendered in parallel
+    all_jobs = parallel_render.class_jobs(generator)
+    jobs = parallel_render.stale_jobs(all_jobs, manifest, class_hashes)
+    print(f"Rendering {len(jobs)} of {len(all_jobs)} per-class files ({len(all_jobs) - len(jobs)} unchanged)")
+    for filename in parallel_render.render_outputs(generator, jobs, mode=args.render_mode,
+                                                   workers=args.render_workers):
+        print(f"Saved {filename}")
+
+    parallel_render.record_jobs(manifest, jobs, class_hashes)
+    parallel_render.save_manifest(manifest)
+
+
+def run_scenario_batch(generator_cls, args):
+    """Solve every what-if scenario of a file and print a comparison table"""
+    from . import scenarios
+
+    scenario_list = scenarios.load_scenarios(args.scenarios)
+    print(f"Solving {len(scenario_list)} scenarios ({args.time_limit:g}s budget each)...")
+
+    results = scenarios.run_scenarios(generator_cls, ROOMS_FILE, COURSES_FILE,
+                                      scenario_list, time_limit=args.time_limit,
+                                      workers=args.scenario_workers)
+    print(scenarios.format_comparison_table(results))
+
+    with open(args.scenario_report, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"Saved {args.scenario_report}")
+
+
+def run_parameter_sweep(generator_cls, args):
+    """Benchmark solver parameters and save a recommended profile per instance size"""
+    from . import parameter_sweep
+
+    with open(args.sweep, 'r', encoding='utf-8') as f:
+        sweep = json.load(f)
+
+    print(f"Running parameter sweep over {len(sweep['instances'])} instances...")
+    results = parameter_sweep.run_sweep(generator_cls, sweep, workers=args.sweep_workers)
+
+    for result in results:
+        print(f"{result['instance']} {result['parameters']}: {result['status']}, "
+              f"first solution {result['time_to_first_solution']}, optimal {result['time_to_optimal']}, "
+              f"gap {result['gap']}")
+
+    with open(args.sweep_output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"Saved {args.sweep_output}")
+
+    profile = parameter_sweep.recommend_profile(results, sweep.get('time_limit', 60))
+    if not profile['buckets']:
+        print("No run found a solution, the profile recommends no parameters")
+    with open(args.sweep_profile, 'w', encoding='utf-8') as f:
+        json.dump(profile, f, indent=2)
+    print(f"Saved {args.sweep_profile}")
+
+
+def run_solve(generator_cls, args):
+    if args.scenarios:
+        run_scenario_batch(generator_cls, args)
+        return
+
+    if args.sweep:
+        run_parameter_sweep(generator_cls, args)
+        return
+
+    # Create the timetable generator
+    generator = generator_cls(ROOMS_FILE, COURSES_FILE)
+
+    # Build the model
+    print("Building the constraint model...")
+    generator.build_model()
+
+    # Solve the model
+    print("Solving the model (this may take a few minutes)...")
+    if args.lexicographic:
+        solved = generator.solve_hierarchical(args.lexicographic, time_limit=args.time_limit,
+                                              solver_profile=args.solver_profile)
+    else:
+        solved = generator.solve_model(time_limit=args.time_limit, checkpoint_file=args.checkpoint,
+                                       checkpoint_interval=args.checkpoint_interval, resume=args.resume,
+                                       solver_profile=args.solver_profile)
+
+    if not solved:
+        print("Failed to find a feasible solution. Try relaxing some constraints.")
+        return
+    print("Model solved successfully!")
+
+    # Save the raw timetable so it can be edited by hand, re-validated and re-rendered
+    generator.export_timetable_json("timetable.json")
+    print("Saved timetable.json")
+
+    # Utilization and load statistics, cheap enough for every solve
+    write_statistics(generator)
+
+    write_outputs(generator, args)
+    print("All timetables generated successfully!")
+
+
+def run_render(generator_cls, args):
+    generator = load_solved_generator(generator_cls, args.timetable)
+    write_outputs(generator, args)
+    print("All timetables generated successfully!")
+
+
+def run_validate(generator_cls, args):
+    from . import timetable_validator
+
+    generator = generator_cls(ROOMS_FILE, COURSES_FILE)
+    with open(args.timetable_file, 'r', encoding='utf-8') as f:
+        violations = generator.validate(json.load(f))
+    print(timetable_validator.format_violations(violations))
+    raise SystemExit(1 if violations else 0)
+
+
+def run_stats(generator_cls, args):
+    write_statistics(load_solved_generator(generator_cls, args.timetable))
+
+
+def run_room_query(generator_cls, args):
+    """Answer a free-room or free-slot lookup from a saved timetable"""
+    generator = generator_cls(ROOMS_FILE, COURSES_FILE)
+    with open(args.timetable, 'r', encoding='utf-8') as f:
+        occupancy = generator.room_occupancy(json.load(f))
+
+    start = time.perf_counter()
+    if args.command == 'free-rooms':
+        period = args.period
+        if period.isdigit():
+            if not 1 <= int(period) <= len(occupancy.periods):
+                raise ValueError(f"Unknown period {period}, expected 1 to {len(occupancy.periods)} "
+                                 f"or one of {occupancy.periods}")
+            period = int(period) - 1
+        rooms = occupancy.free_rooms(args.day, period, min_capacity=args.min_capacity)
+        elapsed = time.perf_counter() - start
+        for room in rooms:
+            print(f"{room['building']} {room['num']} ({room['capacity']} places)")
+        print(f"{len(rooms)} free room(s) found in {elapsed * 1e6:.0f} µs")
+    else:
+        slots = occupancy.free_slots(room=args.room, min_capacity=args.min_capacity)
+        elapsed = time.perf_counter() - start
+        for day, period in slots:
+            print(f"{day} {period}")
+        print(f"{len(slots)} free slot(s) found in {elapsed * 1e6:.0f} µs")
+
+
+COMMANDS = {
+    'solve': run_solve,
+    'render': run_render,
+    'validate': run_validate,
+    'stats': run_stats,
+    'free-rooms': run_room_query,
+    'free-slots': run_room_query
+}
+
+
+def main(generator_cls, argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    # The session table is written after the solve, a missing engine must not cost the run
+    if getattr(args, 'export_table', None):
+        try:
+            check_table_export(args.export_table)
+        except (ValueError, ImportError) as exc:
+            parser.error(str(exc))
+
+    command = args.command or 'solve'
+    if command == 'solve' and args.validate:
+        # Older spelling of the validate command
+        command = 'validate'
+        args.timetable_file = args.validate
+
+    # Also applies to the scenario and sweep workers, a partial of the class pickles fine
+    options = {}
+    if getattr(args, 'formulation', None):
+        options['formulation'] = args.formulation
+    if getattr(args, 'idle_gap_weight', 0):
+        options['idle_gap_weight'] = args.idle_gap_weight
+    for name in ['max_daily_sessions', 'max_consecutive_periods']:
+        if getattr(args, name, None) is not None:
+            options[name] = getattr(args, name)
+    if options:
+        generator_cls = functools.partial(generator_cls, **options)
+
+    if command in ('free-rooms', 'free-slots'):
+        # A misspelled day, period or room is a usage error
+        try:
+            run_room_query(generator_cls, args)
+        except ValueError as exc:
+            parser.error(str(exc))
+        return
+
+    COMMANDS[command](generator_cls, args)
@@ -0,0 +1,184 @@
+"""
+Utilization and load statistics of a solved timetable
+
+The sessions are read once into integer NumPy columns and scattered into occupancy
+tensors (rooms x days x periods, classes x days x periods, lecturers x days). Every
+figure is then a reduction over one of these tensors:
+- room utilization per slot, per day and per room
+- distribution of the sessions over the periods, weighted by `period_weights` (the
+  same weights as the objective of build_model)
+- lecturer daily load (sessions per lecturer and day)
+- class idle gaps: free periods between the first and the last session of a day
+
+The result is a plain dict, saved as JSON, and stats_html_section renders it as an
+HTML section.
+"""
+
+import numpy as np
+
+from .timetable_templates import render_template
+
+
+def session_columns(timetable, classes, rooms, days, periods):
+    """Integer (class, room, lecturer, day, period) columns of the scheduled sessions
+
+    Cells the validator reports as unreadable (unknown class or room, malformed cell, see
+    timetable_validator.structure_violations) are left out.
+    """
+    class_ids = {class_id: idx for idx, class_id in enumerate(classes)}
+    room_ids = {(room['building'], room['num']): idx for idx, room in enumerate(rooms)}
+    teacher_ids = {}
+    columns = ([], [], [], [], [])
+
+    for class_id, grid in timetable.items():
+        class_idx = class_ids.get(class_id)
+        if class_idx is None or not isinstance(grid, list):
+            continue
+        for day_idx, row in enumerate(grid[:len(days)]):
+            if not isinstance(row, list):
+                continue
+            for period_idx, cell in enumerate(row[:len(periods)]):
+                if (not cell or not isinstance(cell, dict)
+                        or any(not isinstance(cell.get(field), str) for field in ('teacher', 'building', 'room'))):
+                    continue
+                room_idx = room_ids.get((cell['building'], cell['room']))
+                if room_idx is None:
+                    continue
+                columns[0].append(class_idx)
+                columns[1].append(room_idx)
+                # Unassigned courses share the "TBD" placeholder, it is not a lecturer
+                columns[2].append(-1 if cell['teacher'] == "TBD" else teacher_ids.setdefault(cell['teacher'], len(teacher_ids)))
+                columns[3].append(day_idx)
+                columns[4].append(period_idx)
+
+    class_col, room_col, teacher_col, day_col, period_col = (np.array(column, dtype=np.int64) for column in columns)
+    return class_col, room_col, teacher_col, day_col, period_col, list(teacher_ids)
+
+
+def _rate(value, total):
+    return round(float(value) / total, 4) if total else 0.0
+
+
+def compute_statistics(timetable, classes, rooms, days, periods, period_weights):
+    """Room utilization, period distribution, lecturer load and class idle gaps"""
+    class_col, room_col, teacher_col, day_col, period_col, teachers = session_columns(
+        timetable, classes, rooms, days, periods)
+    days_count, periods_count = len(days), len(periods)
+    sessions = len(class_col)
+
+    # Rooms x days x periods occupancy (a room hosts at most one session per slot)
+    room_occupancy = np.zeros((len(rooms), days_count, periods_count), dtype=bool)
+    room_occupancy[room_col, day_col, period_col] = True
+    room_slots = room_occupancy.sum(axis=(1, 2))
+    per_slot = room_occupancy.mean(axis=0) if len(rooms) else np.zeros((days_count, periods_count))
+
+    # Period distribution against the objective weights
+    period_counts = np.bincount(period_col, minlength=periods_count)
+    weights = np.array(period_weights, dtype=np.int64)
+    weighted_cost = int(period_counts @ weights)
+
+    # Lecturer x day load, only for the days a lecturer teaches
+    lecturer_col = teacher_col[teacher_col >= 0]
+    lecturer_load = np.bincount(lecturer_col * days_count + day_col[teacher_col >= 0],
+                                minlength=len(teachers) * days_count).reshape(len(teachers), days_count)
+    teaching_days = lecturer_load > 0
+
+    # Class idle gaps: span between the first and last session of a day minus its sessions
+    class_occupancy = np.zeros((len(classes), days_count, periods_count), dtype=bool)
+    class_occupancy[class_col, day_col, period_col] = True
+    class_sessions = class_occupancy.sum(axis=2)
+    first = class_occupancy.argmax(axis=2)
+    last = periods_count - 1 - class_occupancy[:, :, ::-1].argmax(axis=2)
+    gaps = np.where(class_sessions > 0, last - first + 1 - class_sessions, 0)
+
+    return {
+        'sessions': sessions,
+        'rooms': {
+            'total': len(rooms),
+            'used': int((room_slots > 0).sum()),
+            'utilization': _rate(room_occupancy.sum(), room_occupancy.size),
+            'per_day': [round(float(rate), 4) for rate in per_slot.mean(axis=1)],
+            'per_slot': [[round(float(rate), 4) for rate in row] for row in per_slot],
+            'per_room': {f"{room['building']} {room['num']}": _rate(room_slots[idx], days_count * periods_count)
+                         for idx, room in enumerate(rooms)}
+        },
+        'periods': {
+            'counts': [int(count) for count in period_counts],
+            'share': [_rate(count, sessions) for count in period_counts],
+            'weights': [int(weight) for weight in weights],
+            'weighted_cost': weighted_cost,
+            'mean_weight': _rate(weighted_cost, sessions)
+        },
+        'lecturers': {
+            'count': len(teachers),
+            'max_daily_load': int(lecturer_load.max()) if lecturer_load.size else 0,
+            'mean_daily_load': _rate(lecturer_load.sum(), teaching_days.sum()),
+            'per_lecturer': {teacher: {'sessions': int(lecturer_load[idx].sum()),
+                                       'days': int(teaching_days[idx].sum()),
+                                       'max_daily_load': int(lecturer_load[idx].max())}
+                             for idx, teacher in enumerate(teachers)}
+        },
+        'classes': {
+            'idle_gaps': int(gaps.sum()),
+            'max_daily_gaps': int(gaps.max()) if gaps.size else 0,
+            'per_class': {class_id: {'idle_gaps': int(gaps[idx].sum()),
+                                     'days': int((class_sessions[idx] > 0).sum())}
+                          for idx, class_id in enumerate(classes)}
+        }
+    }
+
+
+def _percent(rate):
+    return f"{rate * 100:.0f}%"
+
+
+def stats_html_section(stats, days, periods):
+    """Stat cards and tables of compute_statistics, as an HTML section"""
+    cards = [
+        ("Séances", stats['sessions']),
+        ("Salles Utilisées", f"{stats['rooms']['used']} / {stats['rooms']['total']}"),
+        ("Taux d'Occupation des Salles", _percent(stats['rooms']['utilization'])),
+        ("Poids Moyen des Créneaux", stats['periods']['mean_weight']),
+        ("Charge Journalière Max.", stats['lecturers']['max_daily_load']),
+        ("Heures Creuses (classes)", stats['classes']['idle_gaps'])
+    ]
+    parts = ['<section class="stats-section">', '<div class="stats-container">']
+    for label, value in cards:
+        parts.append(f'<div class="stat-card"><div class="stat-label">{label}</div>'
+                     f'<div class="stat-value">{value}</div></div>')
+    parts.append('</div>')
+
+    # Room utilization per slot
+    parts.append("<h3>Occupation des salles par créneau</h3><table><thead><tr><th>Horaire</th>")
+    parts.extend(f"<th>{day}</th>" for day in days)
+    parts.append("<th>Séances</th><th>Poids</th></tr></thead><tbody>")
+    for period_idx, period in enumerate(periods):
+        parts.append(f"<tr><td class=\"time-col\">{period}</td>")
+        parts.extend(f"<td>{_percent(row[period_idx])}</td>" for row in stats['rooms']['per_slot'])
+        parts.append(f"<td>{stats['periods']['counts'][period_idx]}</td>"
+                     f"<td>{stats['periods']['weights'][period_idx]}</td></tr>")
+    parts.append("<tr><td class=\"time-col\">Journée</td>")
+    parts.extend(f"<td>{_percent(rate)}</td>" for rate in stats['rooms']['per_day'])
+    parts.append(f"<td>{stats['sessions']}</td><td>{stats['periods']['weighted_cost']}</td></tr></tbody></table>")
+
+    # Lecturer load
+    parts.append("<h3>Charge des enseignants</h3><table><thead><tr><th>Enseignant</th><th>Séances</th>"
+                 "<th>Jours</th><th>Charge journalière max.</th></tr></thead><tbody>")
+    for teacher, load in sorted(stats['lecturers']['per_lecturer'].items()):
+        parts.append(f"<tr><td>{teacher}</td><td>{load['sessions']}</td><td>{load['days']}</td>"
+                     f"<td>{load['max_daily_load']}</td></tr>")
+    parts.append("</tbody></table>")
+
+    # Class idle gaps
+    parts.append("<h3>Heures creuses des classes</h3><table><thead><tr><th>Classe</th><th>Jours de cours</th>"
+                 "<th>Heures creuses</th></tr></thead><tbody>")
+    for class_id, item in stats['classes']['per_class'].items():
+        parts.append(f"<tr><td>{class_id}</td><td>{item['days']}</td><td>{item['idle_gaps']}</td></tr>")
+    parts.append("</tbody></table></section>")
+
+    return '\n'.join(parts)
+
+
+def iter_stats_html(stats, days, periods):
+    """Standalone statistics page"""
+    yield render_template('v3_stats_page.html', section=stats_html_section(stats, days, periods))
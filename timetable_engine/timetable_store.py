@@ -0,0 +1,226 @@
+"""
+SQLite persistence of solved timetables
+
+Every solved timetable is stored as a new version, so the database keeps the history
+of the department timetables and reports can query it instead of re-solving or
+scraping the rendered pages.
+
+Schema:
+- versions: one row per stored timetable (date, label, solver status and objective,
+  fingerprint of the input data, day and period labels)
+- classes, lecturers, rooms, courses: reference data, shared across versions
+- assignments: one row per scheduled session (version, class, course, lecturer, room,
+  day, period)
+
+Assignments are indexed on (version, lecturer, day, period), (version, room, day, period)
+and (version, class, day, period), so the weekly schedule of a lecturer, a room or a
+class is an index range scan. A version is written with bulk inserts in a single
+transaction: it is stored completely or not at all.
+"""
+
+import hashlib
+import json
+import sqlite3
+import time
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS versions (
+    id INTEGER PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    label TEXT,
+    status TEXT,
+    objective REAL,
+    data_fingerprint TEXT,
+    days TEXT NOT NULL,
+    periods TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS classes (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS lecturers (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS rooms (
+    id INTEGER PRIMARY KEY,
+    building TEXT NOT NULL,
+    num TEXT NOT NULL,
+    capacity INTEGER,
+    UNIQUE (building, num)
+);
+CREATE TABLE IF NOT EXISTS courses (
+    id INTEGER PRIMARY KEY,
+    class_id INTEGER NOT NULL REFERENCES classes (id),
+    code TEXT NOT NULL,
+    name TEXT NOT NULL,
+    lecturer_id INTEGER REFERENCES lecturers (id)
+);
+-- lecturer_id is NULL for "TBD" courses, and a UNIQUE constraint treats NULLs as distinct
+CREATE UNIQUE INDEX IF NOT EXISTS courses_key ON courses (class_id, code, name, COALESCE(lecturer_id, -1));
+CREATE TABLE IF NOT EXISTS assignments (
+    version_id INTEGER NOT NULL REFERENCES versions (id) ON DELETE CASCADE,
+    class_id INTEGER NOT NULL REFERENCES classes (id),
+    course_id INTEGER NOT NULL REFERENCES courses (id),
+    lecturer_id INTEGER REFERENCES lecturers (id),
+    room_id INTEGER NOT NULL REFERENCES rooms (id),
+    day INTEGER NOT NULL,
+    period INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS assignments_lecturer ON assignments (version_id, lecturer_id, day, period);
+CREATE INDEX IF NOT EXISTS assignments_room ON assignments (version_id, room_id, day, period);
+CREATE INDEX IF NOT EXISTS assignments_class ON assignments (version_id, class_id, day, period);
+"""
+
+# Columns returned by the schedule queries
+SCHEDULE_QUERY = """
+SELECT a.day, a.period, c.name, co.code, co.name, COALESCE(l.name, 'TBD'), r.building, r.num
+FROM assignments a
+JOIN classes c ON c.id = a.class_id
+JOIN courses co ON co.id = a.course_id
+LEFT JOIN lecturers l ON l.id = a.lecturer_id
+JOIN rooms r ON r.id = a.room_id
+"""
+
+
+def connect(db_file):
+    """Open (and create if needed) a timetable database"""
+    conn = sqlite3.connect(db_file)
+    conn.execute("PRAGMA foreign_keys = ON")
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version > SCHEMA_VERSION:
+        conn.close()
+        raise ValueError(f"{db_file} uses schema version {version}, this code only knows up to {SCHEMA_VERSION}")
+    with conn:
+        conn.executescript(SCHEMA)
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    return conn
+
+
+def _ids(conn, table, columns, rows):
+    """Insert missing reference rows and map each row to its id"""
+    rows = list(dict.fromkeys(rows))
+    placeholders = ', '.join('?' for _ in columns)
+    conn.executemany(f"INSERT OR IGNORE INTO {table} ({', '.join(columns)}) VALUES ({placeholders})", rows)
+
+    ids = {}
+    for row in conn.execute(f"SELECT id, {', '.join(columns)} FROM {table}"):
+        ids[tuple(row[1:])] = row[0]
+    return ids
+
+
+def save_timetable(conn, generator, label=None, solution_info=None):
+    """Store the solved timetable of a generator as a new version, returns its id"""
+    solution_info = solution_info or {}
+    fingerprint = None
+    if hasattr(generator, 'data_fingerprint'):
+        content = json.dumps(generator.data_fingerprint(), sort_keys=True)
+        fingerprint = hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+    with conn:
+        cursor = conn.execute(
+            "INSERT INTO versions (created_at, label, status, objective, data_fingerprint, days, periods) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (time.strftime('%Y-%m-%d %H:%M:%S'), label, solution_info.get('status'), solution_info.get('objective'),
+             fingerprint, json.dumps(generator.days), json.dumps(generator.periods)))
+        version_id = cursor.lastrowid
+
+        class_ids = _ids(conn, 'classes', ('name',), [(class_id,) for class_id in generator.classes])
+        lecturer_ids = _ids(conn, 'lecturers', ('name',),
+                            [(course['teacher'],) for courses in generator.all_courses.values()
+                             for course in courses if course['teacher'] != "TBD"])
+        conn.executemany("INSERT OR IGNORE INTO rooms (building, num, capacity) VALUES (?, ?, ?)",
+                         [(room['building'], room['num'], room['capacity']) for room in generator.rooms])
+        room_ids = _ids(conn, 'rooms', ('building', 'num'),
+                        [(room['building'], room['num']) for room in generator.rooms])
+
+        def lecturer_id(teacher):
+            return None if teacher == "TBD" else lecturer_ids[(teacher,)]
+
+        course_keys = [(class_ids[(class_id,)], course['code'], course['name'], lecturer_id(course['teacher']))
+                       for class_id in generator.classes for course in generator.all_courses[class_id]]
+        course_ids = _ids(conn, 'courses', ('class_id', 'code', 'name', 'lecturer_id'), course_keys)
+
+        assignments = []
+        for class_id, grid in generator.timetable.items():
+            class_key = class_ids[(class_id,)]
+            for day_idx, row in enumerate(grid):
+                for period_idx, cell in enumerate(row):
+                    if not cell:
+                        continue
+                    teacher = lecturer_id(cell['teacher'])
+                    course = course_ids[(class_key, cell['course_code'], cell['course_name'], teacher)]
+                    room = room_ids[(cell['building'], cell['room'])]
+                    assignments.append((version_id, class_key, course, teacher, room, day_idx, period_idx))
+
+        conn.executemany("INSERT INTO assignments (version_id, class_id, course_id, lecturer_id, room_id, day, period) "
+                         "VALUES (?, ?, ?, ?, ?, ?, ?)", assignments)
+
+    return version_id
+
+
+def list_versions(conn):
+    """Stored versions, newest first"""
+    rows = conn.execute(
+        "SELECT v.id, v.created_at, v.label, v.status, v.objective, COUNT(a.version_id) "
+        "FROM versions v LEFT JOIN assignments a ON a.version_id = v.id "
+        "GROUP BY v.id ORDER BY v.id DESC").fetchall()
+    return [{'id': row[0], 'created_at': row[1], 'label': row[2], 'status': row[3],
+             'objective': row[4], 'sessions': row[5]} for row in rows]
+
+
+def latest_version(conn):
+    row = conn.execute("SELECT MAX(id) FROM versions").fetchone()
+    if row[0] is None:
+        raise ValueError("The database does not contain any timetable")
+    return row[0]
+
+
+def _schedule(conn, condition, value, version_id):
+    if version_id is None:
+        version_id = latest_version(conn)
+    rows = conn.execute(f"{SCHEDULE_QUERY} WHERE a.version_id = ? AND {condition} ORDER BY a.day, a.period",
+                        (version_id, value)).fetchall()
+    return [{'day': row[0], 'period': row[1], 'class_id': row[2], 'course_code': row[3], 'course_name': row[4],
+             'teacher': row[5], 'building': row[6], 'room': row[7]} for row in rows]
+
+
+def teacher_schedule(conn, teacher, version_id=None):
+    """Sessions of a lecturer (as written in the course data), by day and period"""
+    return _schedule(conn, "a.lecturer_id = (SELECT id FROM lecturers WHERE name = ?)", teacher, version_id)
+
+
+def room_schedule(conn, room, version_id=None):
+    """Sessions held in a room (by number), by day and period"""
+    return _schedule(conn, "a.room_id IN (SELECT id FROM rooms WHERE num = ?)", room, version_id)
+
+
+def class_schedule(conn, class_id, version_id=None):
+    """Sessions of a class, by day and period"""
+    return _schedule(conn, "a.class_id = (SELECT id FROM classes WHERE name = ?)", class_id, version_id)
+
+
+def load_timetable(conn, version_id=None):
+    """Rebuild the class -> day -> period grid of a version (the latest by default)"""
+    if version_id is None:
+        version_id = latest_version(conn)
+    row = conn.execute("SELECT days, periods FROM versions WHERE id = ?", (version_id,)).fetchone()
+    if row is None:
+        raise ValueError(f"Unknown timetable version {version_id}")
+    days, periods = json.loads(row[0]), json.loads(row[1])
+
+    timetable = {}
+    for day_idx, period_idx, class_id, code, name, teacher, building, room in conn.execute(
+            f"{SCHEDULE_QUERY} WHERE a.version_id = ?", (version_id,)):
+        if class_id not in timetable:
+            timetable[class_id] = [[None for _ in range(len(periods))] for _ in range(len(days))]
+        timetable[class_id][day_idx][period_idx] = {
+            'course_code': code,
+            'course_name': name,
+            'teacher': teacher,
+            'room': room,
+            'building': building
+        }
+    return timetable
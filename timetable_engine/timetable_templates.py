@@ -0,0 +1,42 @@
+"""
+Static HTML shells of the timetable pages
+
+The styles, headers and navigation scripts of the generated pages live in templates/
+and are read and compiled once per process. A compiled template is a tuple of literal
+chunks alternating with {{ field }} names, so filling it only costs a join and the
+per-class table fragments stay in the generators.
+"""
+
+import functools
+import hashlib
+import os
+import re
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')
+FIELD_PATTERN = re.compile(r'\{\{\s*(\w+)\s*\}\}')
+
+
+@functools.lru_cache(maxsize=None)
+def compile_template(name):
+    """Read a template once and split it into literal chunks and field names"""
+    with open(os.path.join(TEMPLATE_DIR, name), 'r', encoding='utf-8', newline='') as f:
+        return tuple(FIELD_PATTERN.split(f.read()))
+
+
+def render_template(name, **fields):
+    """Fill the {{ field }} placeholders of a template"""
+    parts = compile_template(name)
+    if len(parts) == 1:
+        return parts[0]
+    return ''.join(part if idx % 2 == 0 else str(fields[part]) for idx, part in enumerate(parts))
+
+
+@functools.lru_cache(maxsize=None)
+def templates_fingerprint():
+    """Hash of every template, changes whenever a page shell is edited"""
+    digest = hashlib.sha256()
+    for name in sorted(os.listdir(TEMPLATE_DIR)):
+        digest.update(name.encode('utf-8'))
+        with open(os.path.join(TEMPLATE_DIR, name), 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
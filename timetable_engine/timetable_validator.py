@@ -0,0 +1,265 @@
+"""
+Independent validator for solved or hand-edited timetables
+
+Checks every hard constraint of the generator without using the solver:
+1. No class has two sessions at the same time
+2. No room hosts two sessions at the same time
+3. No teacher teaches two sessions at the same time
+4. Every course of a class is scheduled exactly once per week, or as many times as
+   `sessions` gives (class_id -> weekly sessions of each course) when formulations
+   hold several sessions per course
+5. A class only takes courses from its own curriculum
+6. No session is held in a slot one of its lecturers is not available in (when the
+   `availability` of the courses file is given)
+7. No lecturer teaches more sessions on one day than their max_daily_sessions
+8. No lecturer teaches more than max_consecutive_periods consecutive periods
+(7 and 8 for the `load_rules` of data.lecturer_load_rules)
+
+Sessions are turned into integer NumPy arrays and every clash check is a single
+bincount over (entity, slot) keys, so validation is linear in the number of
+sessions plus the size of the occupancy grids.
+
+Teachers are compared as they appear in the timetable (the joined lecturer string of
+a course), exactly like the teacher constraint of build_model. Teachers listed in
+`ignored_teachers` (e.g. the "TBD" placeholder for formulations that do not treat it as
+one lecturer) are left out of the teacher clash check.
+
+Hand-edited grids are checked for their shape first: unknown classes, grids that are
+not lists of day rows, cells without one of the text CELL_FIELDS and unknown rooms are reported
+(see STRUCTURE_CONSTRAINTS) and left out of the other checks.
+"""
+
+import numpy as np
+
+from .data import is_available
+
+# Fields of a timetable cell, as written by process_solution
+CELL_FIELDS = ['course_code', 'course_name', 'teacher', 'building', 'room']
+
+# Violations of sessions_from_timetable for cells that cannot be read as sessions at all
+STRUCTURE_CONSTRAINTS = {'class', 'cell', 'room'}
+
+
+def violation(constraint, message):
+    return {'constraint': constraint, 'message': message}
+
+
+def sessions_from_assignments(assignments, classes, all_courses, rooms, days, periods):
+    """Turn (class_id, course_idx, room_idx, day_idx, period_idx) keys into sessions"""
+    sessions = []
+    violations = []
+    rooms_count = len(rooms)
+
+    for class_id, course_idx, room_idx, day_idx, period_idx in assignments:
+        courses = all_courses.get(class_id)
+        if courses is None:
+            violations.append(violation('class', f"Unknown class {class_id}"))
+            continue
+        if not 0 <= course_idx < len(courses):
+            violations.append(violation('curriculum', f"{class_id}: course #{course_idx} is not in its curriculum"))
+            continue
+        if not 0 <= room_idx < rooms_count:
+            violations.append(violation('room', f"{class_id}: unknown room #{room_idx}"))
+            continue
+        if not (0 <= day_idx < len(days) and 0 <= period_idx < len(periods)):
+            violations.append(violation('slot', f"{class_id}: invalid slot ({day_idx}, {period_idx})"))
+            continue
+
+        sessions.append((class_id, course_idx, courses[course_idx]['teacher'], room_idx, day_idx, period_idx))
+
+    return sessions, violations
+
+
+def sessions_from_timetable(timetable, classes, all_courses, rooms, days, periods, sessions_per_course=None):
+    """Turn a class -> day -> period grid of cells (as built by process_solution) into sessions"""
+    sessions = []
+    violations = []
+    room_index = {}
+    for room_idx, room in enumerate(rooms):
+        room_index[(room['building'], room['num'])] = room_idx
+
+    for class_id, grid in timetable.items():
+        courses = all_courses.get(class_id)
+        if courses is None:
+            violations.append(violation('class', f"Unknown class {class_id}"))
+            continue
+        if not isinstance(grid, list) or not all(isinstance(row, list) for row in grid):
+            violations.append(violation('cell', f"{class_id}: the grid must be a list of days, each a list of periods"))
+            continue
+        # A code can appear several times in a curriculum (one entry per weekly session),
+        # cells with that code are matched to its entries in order, each entry taking as
+        # many cells as it has weekly sessions
+        course_index = {}
+        for course_idx, course in enumerate(courses):
+            count = sessions_per_course[class_id][course_idx] if sessions_per_course else 1
+            course_index.setdefault(course['code'], []).extend([course_idx] * count)
+        code_uses = {}
+
+        if len(grid) > len(days) or any(len(row) > len(periods) for row in grid):
+            violations.append(violation('slot', f"{class_id}: grid is larger than {len(days)} days x {len(periods)} periods"))
+
+        for day_idx, row in enumerate(grid[:len(days)]):
+            for period_idx, cell in enumerate(row[:len(periods)]):
+                if not cell:
+                    continue
+                if not isinstance(cell, dict) or any(not isinstance(cell.get(field), str) for field in CELL_FIELDS):
+                    violations.append(violation('cell', f"{class_id}: the cell on {days[day_idx]} {periods[period_idx]} "
+                                                f"must have the text fields {', '.join(CELL_FIELDS)}"))
+                    continue
+
+                # A course from outside the curriculum still takes a room and a teacher, it is
+                # only left out of the coverage count (course_idx None)
+                entries = course_index.get(cell['course_code'])
+                if entries is None:
+                    violations.append(violation('curriculum', f"{class_id}: {cell['course_code']} on "
+                                                f"{days[day_idx]} {periods[period_idx]} is not in its curriculum"))
+                    course_idx = None
+                else:
+                    uses = code_uses.get(cell['course_code'], 0)
+                    code_uses[cell['course_code']] = uses + 1
+                    course_idx = entries[min(uses, len(entries) - 1)]
+
+                room_idx = room_index.get((cell['building'], cell['room']))
+                if room_idx is None:
+                    violations.append(violation('room', f"{class_id}: unknown room {cell['building']} {cell['room']} "
+                                                f"on {days[day_idx]} {periods[period_idx]}"))
+                    continue
+
+                sessions.append((class_id, course_idx, cell['teacher'], room_idx, day_idx, period_idx))
+
+    return sessions, violations
+
+
+def check_sessions(sessions, classes, all_courses, rooms, days, periods, sessions_per_course=None,
+                   ignored_teachers=(), availability=None, load_rules=None):
+    """Run the clash and coverage checks over a list of sessions"""
+    violations = []
+    slots = len(days) * len(periods)
+
+    # Integer ids for classes, courses (global index) and teachers
+    class_ids = {class_id: idx for idx, class_id in enumerate(classes)}
+    course_offsets = {}
+    total_courses = 0
+    for class_id in classes:
+        course_offsets[class_id] = total_courses
+        total_courses += len(all_courses[class_id])
+    teacher_ids = {}
+
+    count = len(sessions)
+    class_col = np.empty(count, dtype=np.int64)
+    course_col = np.empty(count, dtype=np.int64)
+    teacher_col = np.empty(count, dtype=np.int64)
+    room_col = np.empty(count, dtype=np.int64)
+    slot_col = np.empty(count, dtype=np.int64)
+
+    for idx, (class_id, course_idx, teacher, room_idx, day_idx, period_idx) in enumerate(sessions):
+        class_col[idx] = class_ids[class_id]
+        course_col[idx] = -1 if course_idx is None else course_offsets[class_id] + course_idx
+        teacher_col[idx] = -1 if teacher in ignored_teachers else teacher_ids.setdefault(teacher, len(teacher_ids))
+        room_col[idx] = room_idx
+        slot_col[idx] = day_idx * len(periods) + period_idx
+
+    teachers = list(teacher_ids)
+
+    def slot_label(slot):
+        return f"{days[slot // len(periods)]} {periods[slot % len(periods)]}"
+
+    # Clashes: an (entity, slot) key used more than once
+    clash_checks = [
+        ('class_clash', class_col, len(classes), lambda idx: classes[idx]),
+        ('room_clash', room_col, len(rooms), lambda idx: f"{rooms[idx]['building']} {rooms[idx]['num']}"),
+        ('teacher_clash', teacher_col, len(teachers), lambda idx: teachers[idx])
+    ]
+    for constraint, entity_col, entities, label in clash_checks:
+        keys = entity_col * slots + slot_col
+        keys = keys[entity_col >= 0]
+        occupancy = np.bincount(keys, minlength=entities * slots)
+        for key in np.flatnonzero(occupancy > 1):
+            entity, slot = divmod(int(key), slots)
+            violations.append(violation(constraint, f"{label(entity)} has {occupancy[key]} sessions on {slot_label(slot)}"))
+
+    # Coverage: every course of every class exactly once (or its number of weekly sessions)
+    scheduled = np.bincount(course_col[course_col >= 0], minlength=total_courses)
+    for class_id in classes:
+        offset = course_offsets[class_id]
+        for course_idx, course in enumerate(all_courses[class_id]):
+            times = scheduled[offset + course_idx]
+            expected = sessions_per_course[class_id][course_idx] if sessions_per_course else 1
+            if times != expected:
+                message = f"{class_id}: {course['code']} is scheduled {times} times"
+                if expected != 1:
+                    message += f" instead of {expected}"
+                violations.append(violation('course_count', message))
+
+    # Availability: sessions in slots blocked by one of their lecturers
+    if availability:
+        for class_id, _, teacher, _, day_idx, period_idx in sessions:
+            if not is_available(availability, teacher, days[day_idx], period_idx):
+                violations.append(violation('availability', f"{class_id}: {teacher} is not available on "
+                                            f"{days[day_idx]} {periods[period_idx]}"))
+
+    if load_rules:
+        violations.extend(check_lecturer_loads(sessions, days, periods, load_rules))
+
+    return violations
+
+
+def check_lecturer_loads(sessions, days, periods, load_rules):
+    """Daily load and consecutive periods of every lecturer with a load limit"""
+    violations = []
+    slot_sessions = {}
+    for _, _, teacher, _, day_idx, period_idx in sessions:
+        key = (teacher, day_idx, period_idx)
+        slot_sessions[key] = slot_sessions.get(key, 0) + 1
+
+    for lecturer, teachers, limits in load_rules:
+        max_daily = limits.get('max_daily_sessions')
+        max_consecutive = limits.get('max_consecutive_periods')
+        for day_idx, day in enumerate(days):
+            loads = [sum(slot_sessions.get((teacher, day_idx, period_idx), 0) for teacher in teachers)
+                     for period_idx in range(len(periods))]
+            if max_daily is not None and sum(loads) > max_daily:
+                violations.append(violation('lecturer_daily_load', f"{lecturer} has {sum(loads)} sessions on {day} "
+                                            f"(at most {max_daily})"))
+            if max_consecutive is None:
+                continue
+            run = 0
+            for period_idx, load in enumerate(loads):
+                run = run + 1 if load else 0
+                if run == max_consecutive + 1:
+                    violations.append(violation('lecturer_consecutive', f"{lecturer} teaches more than "
+                                                f"{max_consecutive} consecutive periods on {day}, up to "
+                                                f"{periods[period_idx]}"))
+    return violations
+
+
+def validate_assignments(assignments, classes, all_courses, rooms, days, periods, sessions=None,
+                         ignored_teachers=(), availability=None, load_rules=None):
+    """Validate raw assignment keys (e.g. the content of a checkpoint)"""
+    found, violations = sessions_from_assignments(assignments, classes, all_courses, rooms, days, periods)
+    return violations + check_sessions(found, classes, all_courses, rooms, days, periods, sessions,
+                                       ignored_teachers, availability, load_rules)
+
+
+def structure_violations(timetable, classes, all_courses, rooms, days, periods):
+    """Cells of a timetable grid that cannot be read as sessions (unknown class or room, malformed cell)"""
+    _, violations = sessions_from_timetable(timetable, classes, all_courses, rooms, days, periods)
+    return [item for item in violations if item['constraint'] in STRUCTURE_CONSTRAINTS]
+
+
+def validate_timetable(timetable, classes, all_courses, rooms, days, periods, sessions=None,
+                       ignored_teachers=(), availability=None, load_rules=None):
+    """Validate a class -> day -> period timetable grid, returns a list of violations"""
+    found, violations = sessions_from_timetable(timetable, classes, all_courses, rooms, days, periods, sessions)
+    return violations + check_sessions(found, classes, all_courses, rooms, days, periods, sessions,
+                                       ignored_teachers, availability, load_rules)
+
+
+def format_violations(violations):
+    if not violations:
+        return "Timetable is valid: all hard constraints are satisfied"
+
+    lines = [f"{len(violations)} constraint violation(s):"]
+    for item in violations:
+        lines.append(f"- [{item['constraint']}] {item['message']}")
+    return '\n'.join(lines)